@@ -0,0 +1,166 @@
+# Memory and widget count diagnostics for finding leaks and widget churn in the GUI
+import time  # For timing tracked operations
+import tracemalloc  # For Python memory snapshots
+from collections import deque  # For the bounded history of tracked operations
+from functools import wraps  # For keeping the names of tracked functions
+from tkinter import TclError  # Raised by widgets that were destroyed
+
+
+def count_widgets(widget, ignore=()):
+    """Returns the number of live widgets under widget, itself included, leaving out the ignored ones."""
+    if widget in ignore:
+        return 0
+    try:
+        children = widget.winfo_children()
+    except TclError:  # Destroyed
+        return 0
+    return 1 + sum(count_widgets(child, ignore) for child in children)
+
+
+class Diagnostics:
+    """Measures live Tk widgets and Python memory around GUI operations.
+
+    Functions wrapped with track() are measured before and after each call once start() has
+    been called: widget counts of the whole application and of every watched container, Tcl
+    commands (Python callbacks registered with Tk, which leak with widgets that are never
+    destroyed), and traced memory with the source lines that allocated the most. Each call
+    is kept in a bounded history and passed to log as text. Until start() tracked functions
+    run without any overhead besides one check.
+    """
+
+    def __init__(self, root=None, log=None, frames=5, top=5, history=50):
+        self.root = root
+        self.log = log  # Called with the text of every measured operation
+        self.frames = frames  # Stack frames kept per traced allocation
+        self.top = top  # Allocation sites listed per measurement
+        self.containers = {}  # Name -> watched container widget
+        self.ignored = set()  # Widgets left out of the counts, such as the diagnostics window
+        self.history = deque(maxlen=history)  # (label, delta) of the latest tracked operations
+        self.enabled = False
+        self.baseline = None  # Sample the growth is measured from
+        self._active = False  # A tracked operation is being measured
+
+    def start(self):
+        """Starts tracing memory and measuring tracked operations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.enabled = True
+        self.reset_baseline()
+
+    def stop(self):
+        """Stops measuring and tracing; the history is kept."""
+        self.enabled = False
+        self.baseline = None
+        tracemalloc.stop()
+
+    def reset_baseline(self):
+        """Measures growth from now on."""
+        self.baseline = self.sample("baseline")
+
+    def watch(self, name, widget):
+        """Reports the widget count of a container under name; a destroyed container counts 0."""
+        self.containers[name] = widget
+
+    def ignore(self, widget):
+        """Leaves a widget and its children out of the counts until the widget is destroyed."""
+        self.ignored.add(widget)
+
+        def forget(event):
+            if event.widget is widget:  # A toplevel's bindings also fire for the destruction of its children
+                self.ignored.discard(widget)  # Do not keep dead widgets alive
+
+        widget.bind("<Destroy>", forget, add="+")
+
+    def widget_counts(self):
+        """Returns {"all widgets": count, container name: count, ...}."""
+        counts = {"all widgets": count_widgets(self.root, self.ignored) if self.root is not None else 0}
+        for name, widget in self.containers.items():
+            counts[name] = count_widgets(widget, self.ignored)
+        return counts
+
+    def tcl_commands(self):
+        """Returns the number of Tcl commands, which grows with every Python callback registered with Tk."""
+        if self.root is None:
+            return 0
+        return len(self.root.tk.splitlist(self.root.tk.call("info", "commands")))
+
+    def sample(self, label):
+        """Returns the current widget counts, Tcl commands and memory of the application."""
+        snapshot = None
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),  # The samples and history themselves
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+        return {
+            "label": label,
+            "time": time.perf_counter(),
+            "widgets": self.widget_counts(),
+            "tcl_commands": self.tcl_commands(),
+            "memory": tracemalloc.get_traced_memory()[0] if snapshot else 0,
+            "snapshot": snapshot,
+        }
+
+    def compare(self, before, after):
+        """Returns the growth from one sample to another: widgets per container, Tcl commands, memory and allocation sites."""
+        widgets = {name: count - before["widgets"].get(name, 0) for name, count in after["widgets"].items()}
+        allocations = []
+        if before["snapshot"] and after["snapshot"]:
+            for stat in after["snapshot"].compare_to(before["snapshot"], "lineno")[:self.top]:
+                if stat.size_diff:
+                    frame = stat.traceback[0]
+                    allocations.append((f"{frame.filename}:{frame.lineno}", stat.size_diff, stat.count_diff))
+        return {
+            "label": after["label"],
+            "seconds": after["time"] - before["time"],
+            "widgets": widgets,
+            "tcl_commands": after["tcl_commands"] - before["tcl_commands"],
+            "memory": after["memory"] - before["memory"],
+            "allocations": allocations,
+        }
+
+    def track(self, label):
+        """Decorator measuring every call of a function once diagnostics are started."""
+        def decorator(function):
+            @wraps(function)
+            def tracked(*args, **kwargs):
+                if not self.enabled or self._active:  # Calls made by a tracked call count towards it
+                    return function(*args, **kwargs)
+                self._active = True
+                before = self.sample(label)
+                started = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    seconds = time.perf_counter() - started
+                    delta = self.compare(before, self.sample(label))
+                    delta["seconds"] = seconds  # Without the time spent taking the samples
+                    self._active = False
+                    self.history.append((label, delta))
+                    if self.log:
+                        self.log(format_delta(delta))
+            return tracked
+        return decorator
+
+    def report(self):
+        """Returns a text report: live counts, growth since the baseline and the latest tracked operations."""
+        if not self.enabled:
+            return "Diagnostics are off."
+        lines = ["Live widgets:"]
+        current = self.sample("since baseline")
+        lines += [f"  {name}: {count}" for name, count in current["widgets"].items()]
+        lines.append(f"Tcl commands: {current['tcl_commands']}")
+        lines.append(f"Traced memory: {current['memory'] / 1024:.1f} KiB")
+        lines += ["", "Growth:", format_delta(self.compare(self.baseline, current)), "", "Latest operations:"]
+        lines += [format_delta(delta) for _, delta in reversed(self.history)] or ["  (none yet)"]
+        return "\n".join(lines)
+
+
+def format_delta(delta):
+    """Returns the text of one measurement, e.g. for a log."""
+    widgets = ", ".join(f"{name} {count:+d}" for name, count in delta["widgets"].items())
+    lines = [f"{delta['label']}: {delta['seconds'] * 1000:.1f} ms, widgets {widgets}, "
+             f"Tcl commands {delta['tcl_commands']:+d}, memory {delta['memory'] / 1024:+.1f} KiB"]
+    lines += [f"    {site}: {size / 1024:+.1f} KiB in {count:+d} blocks" for site, size, count in delta["allocations"]]
+    return "\n".join(lines)
@@ -0,0 +1,310 @@
+# Excel export of the calendar, cached so exporting an unchanged calendar again is instant
+import hashlib  # For fingerprinting the calendar content
+import json  # For building stable fingerprints
+from datetime import datetime  # For date manipulation
+from io import BytesIO  # For keeping the exported file in memory
+
+import openpyxl  # Library for handling Excel files
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side  # Styles for Excel cells
+from openpyxl.utils import get_column_letter  # Utility to convert column numbers to letters
+
+from calendar_model import HOLIDAY_EVENTS, SEMESTERS  # Holiday festivals and semesters tracked by the calendar
+
+TITLE = 'Amrita School of Engineering Bengaluru'
+SUBTITLE = 'ACADEMIC CALENDAR (2024 - 2025) ODD SEMESTER'
+HEADERS = ["Date", "Day"] + SEMESTERS + ["Events/Holidays"]
+
+# Define events that should be colored light blue (academic events)
+LIGHT_BLUE_EVENTS = [
+    'Enrolment and commencement of classes for all UG and PG / commencement',
+    'Finalisation of electives',
+    'First Class committee meeting',
+    'Commencement of Mid-Semester Exam',
+    'Completion of quizzes, midsem and attendance entry in AUMS',
+    'Second class committee',
+    'Missed mid semester exam',
+    'Pre-registration for next sem, course end survey, faculty feedback',
+    'Finalisation of internals and attendance',
+    'Last instruction day',
+    'Commencement of end-semester exams'
+]
+
+# Define events that should be colored light violet (festivals/cultural events)
+LIGHT_VIOLET_EVENTS = [
+    'Sree Krishna Janmashtami',
+    'Ganesh Chaturthi',
+    'Deepavali'
+]
+
+# Define cell styles, shared by every cell that uses them
+HEADER_FILL = PatternFill(start_color="4F6228", end_color="4F6228", fill_type="solid")  # Header fill color
+SUBHEADER_FILL = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")  # Subheader fill color
+HOLIDAY_FILL = PatternFill(start_color="ED7D31", end_color="ED7D31", fill_type="solid")  # Holiday fill color
+LIGHT_BLUE_FILL = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")  # Light blue fill for academic events
+LIGHT_VIOLET_FILL = PatternFill(start_color="E4D7F1", end_color="E4D7F1", fill_type="solid")  # Light violet fill for cultural events
+BORDER = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))  # Cell border style
+CENTER = Alignment(horizontal='center')
+EVENT_ALIGNMENT = Alignment(horizontal='left', wrap_text=True)
+
+# (fingerprint, file content) of the last export
+_output_cache = (None, None)
+
+
+def fingerprint(data):
+    """Returns a short stable hash of JSON friendly data."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def column_layout(model):
+    """Groups semesters starting on the same date into one column; returns (groups, column mapping, column count)."""
+    # Group semesters by start date
+    semesters_by_start_date = {}
+    for sem_name, (start_date, end_date) in model.semesters.items():
+        start_date_str = start_date.strftime("%Y-%m-%d")
+        if start_date_str not in semesters_by_start_date:
+            semesters_by_start_date[start_date_str] = {
+                'semesters': [],
+                'start_date': datetime.combine(start_date, datetime.min.time()),
+                'end_date': datetime.combine(end_date, datetime.min.time())
+            }
+        semesters_by_start_date[start_date_str]['semesters'].append(sem_name)
+        end_date = datetime.combine(end_date, datetime.min.time())
+        if end_date > semesters_by_start_date[start_date_str]['end_date']:
+            semesters_by_start_date[start_date_str]['end_date'] = end_date
+
+    # Map each semester's column to its merged column
+    merged_column_mapping = {}
+    current_col = 3
+    for start_date_str, group_info in sorted(semesters_by_start_date.items()):
+        for sem in group_info['semesters']:
+            merged_column_mapping[HEADERS.index(sem) + 1] = current_col
+        current_col += 1
+
+    return semesters_by_start_date, merged_column_mapping, current_col
+
+
+def month_blocks(model):
+    """Splits the calendar range into months; yields (month name, [(date, schedule ID, schedule text, is working day), ...])."""
+    current_month = None
+    days = []
+    for day in model.days():
+        month = day.strftime("%B - %Y")
+        if month != current_month and days:
+            yield current_month, days
+            days = []
+        current_month = month
+        days.append((datetime.combine(day, datetime.min.time()), model.schedule_id(day), model.schedule_text(day), model.is_working_day(day)))
+    if days:
+        yield current_month, days
+
+
+def build_month_block(sheet, row, current_month, days, layout, working_days):
+    """Lays out the rows of one month below row, which is left blank, and updates the running working day counts.
+
+    Returns the row after the month.
+    """
+    semesters_by_start_date, merged_column_mapping, total_columns = layout
+    events_col = total_columns  # Last column for events
+
+    # Create a new row for the month header
+    row += 1
+    # Merge cells across all columns for the month header
+    sheet.merge_cells(start_row=row, start_column=1, end_row=row, end_column=total_columns)
+    month_cell = sheet.cell(row=row, column=1, value=current_month)
+    month_cell.font = Font(bold=True)
+    month_cell.fill = HOLIDAY_FILL  # Orange color
+    month_cell.alignment = Alignment(horizontal='center', vertical='center')
+    month_cell.border = BORDER  # Add border to the merged cell
+
+    # Add borders to all cells in the merged range
+    for col in range(1, total_columns + 1):
+        cell = sheet.cell(row=row, column=col)
+        cell.border = BORDER
+
+    row += 1
+    current_event = None
+    event_start_row = None
+
+    for date, event_id, event_text, is_working_day in days:
+        # Write date and day
+        sheet.cell(row=row, column=1, value=date.strftime("%d-%b"))
+        sheet.cell(row=row, column=2, value=date.strftime("%a"))
+
+        # Apply borders and alignment
+        for col in range(1, total_columns + 1):
+            cell = sheet.cell(row=row, column=col)
+            cell.border = BORDER
+            cell.alignment = CENTER
+
+        # Sundays, even Saturdays and holidays are not working days, as decided by the model
+        if not is_working_day:
+            for col in range(1, total_columns + 1):
+                sheet.cell(row=row, column=col).fill = HOLIDAY_FILL
+        else:  # Handle working day counts
+            for start_date_str, group_info in semesters_by_start_date.items():
+                sems = group_info['semesters']
+                if group_info['start_date'] <= date <= group_info['end_date']:
+                    merged_col = None
+                    for sem in sems:
+                        merged_col = merged_column_mapping[HEADERS.index(sem) + 1]
+                        working_days[sem] += 1
+
+                    if merged_col is not None:
+                        counts = [str(working_days[sem]) for sem in sems]
+                        if all(counts[0] == count for count in counts):
+                            sheet.cell(row=row, column=merged_col, value=counts[0])
+                        else:
+                            sheet.cell(row=row, column=merged_col, value="/".join(counts))
+
+        # Handle events and merging
+        if event_text:
+            event_cell = sheet.cell(row=row, column=events_col, value=event_text)
+            event_cell.alignment = EVENT_ALIGNMENT
+
+            # Check if this is a continuation of the current event
+            if event_id == current_event:  # Same ID means same schedule text
+                # Don't set the value again, just track the row
+                sheet.cell(row=row, column=events_col, value="")
+            else:
+                # If there was a previous event, merge its cells
+                if current_event is not None and event_start_row is not None:
+                    sheet.merge_cells(start_row=event_start_row, start_column=events_col,
+                                      end_row=row - 1, end_column=events_col)
+                # Start tracking new event
+                current_event = event_id
+                event_start_row = row
+
+            # Apply appropriate fills based on event type
+            if any(event in event_text for event in LIGHT_BLUE_EVENTS):
+                for col in range(1, total_columns + 1):
+                    sheet.cell(row=row, column=col).fill = LIGHT_BLUE_FILL
+            elif any(event in event_text for event in LIGHT_VIOLET_EVENTS):
+                for col in range(1, total_columns + 1):
+                    sheet.cell(row=row, column=col).fill = LIGHT_VIOLET_FILL
+            elif any(event in event_text for event in HOLIDAY_EVENTS):
+                for col in range(1, total_columns + 1):
+                    sheet.cell(row=row, column=col).fill = HOLIDAY_FILL
+        else:
+            # If there was an event and it's ending, merge its cells
+            if current_event is not None and event_start_row is not None:
+                sheet.merge_cells(start_row=event_start_row, start_column=events_col,
+                                  end_row=row - 1, end_column=events_col)
+                current_event = None
+                event_start_row = None
+
+        row += 1
+
+    # Merge cells for an event that reaches the end of the month; merges never cross a month header
+    if current_event is not None and event_start_row is not None:
+        sheet.merge_cells(start_row=event_start_row, start_column=events_col,
+                          end_row=row - 1, end_column=events_col)
+
+    return row
+
+
+def build_workbook(model):
+    """Builds the Excel workbook of the calendar."""
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = "Calendar"
+
+    layout = column_layout(model)
+    semesters_by_start_date, merged_column_mapping, total_columns = layout
+
+    # Create merged headers
+    merged_headers = ["Date", "Day"]
+    for start_date_str, group_info in sorted(semesters_by_start_date.items()):
+        merged_headers.append(" & ".join(group_info['semesters']))
+    merged_headers.append("Events/Holidays")
+
+    # Write merged headers
+    for col, header in enumerate(merged_headers, start=1):
+        cell = sheet.cell(row=3, column=col, value=header)
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.fill = HEADER_FILL
+        cell.border = BORDER
+        cell.alignment = Alignment(wrap_text=True, horizontal='center', vertical='center')
+
+    # Merge cells for the title and subtitle based on the number of semesters
+    for r in range(1, 3):
+        sheet.merge_cells(start_row=r, start_column=1, end_row=r, end_column=total_columns)  # Merge cells for title and subtitle
+        cell = sheet.cell(row=r, column=1)  # Get the first column of the merged cells
+        cell.font = Font(bold=True, size=14 if r == 1 else 12)
+        cell.alignment = Alignment(horizontal='center')
+
+    # Set title and subtitle
+    sheet['A1'] = TITLE
+    sheet['A2'] = SUBTITLE
+
+    for i, width in enumerate([15] * (total_columns - 1) + [40], start=1):  # Last column (Events/Holidays) wider
+        sheet.column_dimensions[get_column_letter(i)].width = width
+
+    # Lay out each month
+    working_days = {sem: 0 for sem in SEMESTERS}  # Working day counters for each semester
+    row = 4  # Start from row 4 (after headers)
+    for current_month, days in month_blocks(model):
+        row = build_month_block(sheet, row, current_month, days, layout, working_days)
+
+    # Add Working Days Breakdown by Weekday
+    row += 2  # Leave some space after the last data row
+    breakdown_title = sheet.cell(row=row, column=1, value="Working Days Breakdown by Weekday")
+    breakdown_title.font = Font(bold=True, size=12)
+    breakdown_title.alignment = Alignment(horizontal='center')
+    sheet.merge_cells(start_row=row, start_column=1, end_row=row, end_column=total_columns)
+    for col in range(1, total_columns + 1):
+        cell = sheet.cell(row=row, column=col)
+        cell.border = BORDER  # Add border to the title cell
+        cell.fill = SUBHEADER_FILL
+    row += 1
+
+    for day, data in model.working_days_by_weekday().items():
+        # Display the weekday and its count
+        weekday_cell = sheet.cell(row=row, column=1, value=f"{day}: {data['count']} days")
+        weekday_cell.font = Font(bold=True)
+        weekday_cell.alignment = Alignment(horizontal='left')
+        weekday_cell.border = BORDER
+
+        # List dates for each weekday
+        dates_cell = sheet.cell(row=row, column=2, value=", ".join(data["dates"]))
+        dates_cell.alignment = Alignment(horizontal='left', wrap_text=True)
+        dates_cell.border = BORDER
+        row += 1
+
+    # Add Total Working Days Below Each Column
+    total_working_days_row = row + 2  # Leave some space after the last data row
+
+    # Title for Total Working Days
+    title_cell = sheet.cell(row=total_working_days_row, column=1, value="Total Working Days")
+    title_cell.font = Font(bold=True)
+    title_cell.alignment = Alignment(horizontal="center")
+    sheet.merge_cells(start_row=total_working_days_row, start_column=1, end_row=total_working_days_row, end_column=2)
+
+    for sem_name, count in working_days.items():
+        # Place total working days below the respective semester column
+        column_index = HEADERS.index(sem_name) + 1  # Find the correct column
+        total_cell = sheet.cell(row=total_working_days_row, column=column_index, value=count)
+        total_cell.font = Font(bold=True)
+        total_cell.alignment = Alignment(horizontal="center")
+        total_cell.border = BORDER
+
+    return wb
+
+
+def export_fingerprint(model):
+    """Returns a fingerprint of everything the exported file depends on: range, semesters, events and categories."""
+    return fingerprint([
+        model.start, model.end, sorted(model.semesters.items()),
+        [(day, model.schedule_text(day)) for day in model.days()],
+        LIGHT_BLUE_EVENTS, LIGHT_VIOLET_EVENTS, HOLIDAY_EVENTS, TITLE, SUBTITLE,
+    ])
+
+
+def export_bytes(model):
+    """Returns the calendar as the content of an .xlsx file, reusing the last export if nothing changed."""
+    global _output_cache
+    key = export_fingerprint(model)
+    if _output_cache[0] != key:
+        output = BytesIO()
+        build_workbook(model).save(output)
+        _output_cache = (key, output.getvalue())
+    return _output_cache[1]
@@ -0,0 +1,152 @@
+# Month grid view of the calendar drawn on a single canvas
+import tkinter  # For the canvas widget
+from datetime import timedelta  # For date manipulation
+
+from calendar_export import LIGHT_BLUE_EVENTS, LIGHT_VIOLET_EVENTS  # Event categories, as coloured in Excel
+from calendar_model import DAY_NAMES, day_span, parse_date  # Calendar helpers
+
+CELL_WIDTH = 110
+CELL_HEIGHT = 64
+TITLE_HEIGHT = 30
+HEADER_HEIGHT = 20
+MONTH_GAP = 12
+MAX_CELL_TEXT = 70  # Longer schedules are shortened to fit in a cell
+
+# Cell colours (fill, text), matching the Excel export
+DEFAULT_COLORS = ("#2b2b2b", "#DCE4EE")
+HOLIDAY_COLORS = ("#ED7D31", "#000000")
+LIGHT_BLUE_COLORS = ("#DDEBF7", "#000000")
+LIGHT_VIOLET_COLORS = ("#E4D7F1", "#000000")
+
+
+class MonthGridView(tkinter.Canvas):
+    """Shows the calendar as month grids (one row per week) on a single canvas.
+
+    Every date is a rectangle and two text items tagged with the date, so an edit only
+    reconfigures the items of the edited dates. Every item is also tagged with its month, so a
+    range change only redraws the months gaining or losing dates and moves the others.
+    Clicking a date calls on_click(date).
+    """
+
+    def __init__(self, master, model, on_click=None, **kwargs):
+        super().__init__(master, width=CELL_WIDTH * 7 + 2, bg="#242424", highlightthickness=0, **kwargs)
+        self.model = model
+        self.on_click = on_click
+        self.cells = {}  # Date -> (rectangle, day number, schedule text) canvas items
+        self.months = {}  # First date of each drawn month -> (top, height)
+        self.tag_bind("cell", "<Button-1>", self._clicked)
+        self.layout()
+
+    def layout(self):
+        """Draws every month of the calendar range from scratch."""
+        self.delete("all")
+        self.cells = {}
+        self.months = {}
+        self.relayout([])
+
+    def relayout(self, changed_days):
+        """Brings the months in line with the calendar range after the given dates entered or left it.
+
+        Months with changed dates are redrawn, the others are only moved to their new position.
+        """
+        changed = {day.replace(day=1) for day in changed_days}
+        old_months = self.months
+        self.months = {}
+        y = 0
+        month_start = self.model.start.replace(day=1) if self.model.start is not None else None
+        while month_start is not None and month_start <= self.model.end:
+            if month_start in old_months and month_start not in changed:
+                top, height = old_months.pop(month_start)
+                if top != y:
+                    self.move(self._month_tag(month_start), 0, y - top)
+            else:
+                old_months.pop(month_start, None)
+                self._delete_month(month_start)
+                height = self._draw_month(month_start, y)
+            self.months[month_start] = (y, height)
+            y += height
+            month_start = (month_start + timedelta(days=32)).replace(day=1)
+
+        for month_start in old_months:  # Months that left the range
+            self._delete_month(month_start)
+        self.configure(scrollregion=(0, 0, CELL_WIDTH * 7 + 2, y) if self.months else (0, 0, 0, 0))
+
+    @staticmethod
+    def _month_tag(month_start):
+        return "m" + month_start.isoformat()
+
+    def _delete_month(self, month_start):
+        self.delete(self._month_tag(month_start))
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        for day in day_span(month_start, next_month - timedelta(days=1)):
+            self.cells.pop(day, None)
+
+    def _draw_month(self, month_start, y):
+        """Draws the dates of one month that are in the calendar range at height y; returns the height used."""
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        first = max(month_start, self.model.start)
+        last = min(next_month - timedelta(days=1), self.model.end)
+        month_tag = self._month_tag(month_start)
+        top = y
+
+        # Month title and weekday names
+        self.create_text(4, y + TITLE_HEIGHT // 2, anchor="w", text=month_start.strftime("%B - %Y"), fill="#DCE4EE", font=("Arial", 13, "bold"), tags=month_tag)
+        y += TITLE_HEIGHT
+        for col, day_name in enumerate(DAY_NAMES):
+            self.create_text(col * CELL_WIDTH + CELL_WIDTH // 2, y + HEADER_HEIGHT // 2, text=day_name[:3], fill="#9DA5B4", font=("Consolas", 10, "bold"), tags=month_tag)
+        y += HEADER_HEIGHT
+
+        # One row per week, Monday first
+        week = 0
+        for day in day_span(first, last):
+            if day != first and day.weekday() == 0:
+                week += 1
+            x0 = day.weekday() * CELL_WIDTH + 1
+            y0 = y + week * CELL_HEIGHT
+            tags = ("cell", "d" + day.isoformat(), month_tag)
+            rectangle = self.create_rectangle(x0, y0, x0 + CELL_WIDTH, y0 + CELL_HEIGHT, outline="#565B5E", tags=tags)
+            number = self.create_text(x0 + 4, y0 + 3, anchor="nw", text=str(day.day), font=("Consolas", 10, "bold"), tags=tags)
+            text = self.create_text(x0 + 4, y0 + 18, anchor="nw", width=CELL_WIDTH - 8, font=("Consolas", 8), tags=tags)
+            self.cells[day] = (rectangle, number, text)
+            self.draw_cell(day)
+        return y + (week + 1) * CELL_HEIGHT + MONTH_GAP - top
+
+    def draw_cell(self, day):
+        """Updates the colour and text of one date."""
+        if day not in self.cells:
+            return
+        rectangle, number, text = self.cells[day]
+        fill, text_color = self.cell_colors(day)
+        schedule = self.model.schedule_text(day)
+        if len(schedule) > MAX_CELL_TEXT:
+            schedule = schedule[:MAX_CELL_TEXT - 1] + "…"
+        self.itemconfigure(rectangle, fill=fill)
+        self.itemconfigure(number, fill=text_color)
+        self.itemconfigure(text, text=schedule, fill=text_color)
+
+    def cell_colors(self, day):
+        """Returns the (fill, text) colours of a date: event categories first, then holidays."""
+        schedule = self.model.schedule_text(day)
+        if any(event in schedule for event in LIGHT_BLUE_EVENTS):
+            return LIGHT_BLUE_COLORS
+        if any(event in schedule for event in LIGHT_VIOLET_EVENTS):
+            return LIGHT_VIOLET_COLORS
+        if not self.model.is_working_day(day):
+            return HOLIDAY_COLORS
+        return DEFAULT_COLORS
+
+    def refresh(self, change):
+        """Brings the view up to date after a calendar change, redrawing only the edited dates or months when possible."""
+        if change["op"]["op"] in ("add_event", "remove_last_event"):
+            for day in change["dates"]:
+                self.draw_cell(parse_date(day))
+        elif change["op"]["op"] == "set_range":
+            self.relayout([parse_date(day) for day in change["dates"]])
+        elif change["op"]["op"] != "set_semesters":
+            self.layout()
+
+    def _clicked(self, event):
+        for tag in self.gettags("current"):
+            if tag.startswith("d") and self.on_click:
+                self.on_click(parse_date(tag[1:]))
+                return
@@ -0,0 +1,186 @@
+# Merges department calendars into one master calendar with a conflict report
+import argparse  # For command line options
+import csv  # For the conflict report
+import heapq  # For merging the department calendars in date order
+import os  # For file names and temporary files
+import re  # For recognising rows of exported workbooks
+import shutil  # For assembling the master project file
+import tempfile  # For writing the master calendar before its range is known
+import zipfile  # For reading merged cells of exported workbooks
+from datetime import datetime  # For date manipulation
+from itertools import groupby  # For grouping merged events by date
+from xml.etree.ElementTree import iterparse  # For streaming through the worksheet XML
+
+from calendar_model import is_holiday_text, project_header, project_line, read_project  # Project files and holiday rule
+
+MONTH_HEADER = re.compile(r"^[A-Z][a-z]+ - (\d{4})$")  # Month header rows, e.g. "July - 2024"
+DATE_CELL = re.compile(r"^\d{2}-[A-Z][a-z]{2}$")  # Date cells, e.g. "15-Jul"
+BASE_SCHEDULE = re.compile(r"^(Sunday|\d(st|nd|rd|th) Saturday( : Holiday)?)$")  # Text the exporter adds on its own
+
+
+def schedule_events(text):
+    """Splits the schedule text of an exported row into its events, leaving out Sunday and Saturday labels."""
+    return [part for part in str(text).split(" | ") if part and not BASE_SCHEDULE.match(part)]
+
+
+def event_merges(path):
+    """Returns {first row: last row} of the multi-day events of an exported workbook.
+
+    Only merged cells spanning several rows of one column are kept, so the dict grows with the
+    number of multi-day events, not with the number of rows. The merges are listed after every
+    row of the worksheet XML, in no particular order, so they are read before the rows.
+    """
+    from openpyxl.utils.cell import range_boundaries  # Only needed for workbooks
+
+    merges = {}
+    with zipfile.ZipFile(path) as archive, archive.open("xl/worksheets/sheet1.xml") as sheet_xml:
+        for _, element in iterparse(sheet_xml):
+            if element.tag.endswith("}mergeCell"):
+                min_col, min_row, max_col, max_row = range_boundaries(element.get("ref"))
+                if min_col == max_col and min_row < max_row:
+                    merges[min_row] = max_row
+            element.clear()  # Keep memory flat on large sheets
+    return merges
+
+
+def read_workbook(path):
+    """Reads a workbook exported by convert_to_excel row by row; yields a header, then (date, events) in date order.
+
+    Every date row is yielded, with or without events, so the dates read cover the exported range.
+    """
+    import openpyxl  # Only needed for workbooks
+
+    merges = event_merges(path)
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        yield {"start": None, "end": None, "semesters": {}}  # Workbooks keep only working day counts per semester
+        events_col = None
+        year = None
+        merged_events, merged_until = [], 0
+        for row_number, row in enumerate(wb.worksheets[0].iter_rows(values_only=True), start=1):
+            first = row[0] if row else None
+            if row_number == 3:
+                events_col = list(row).index("Events/Holidays")
+            elif isinstance(first, str) and MONTH_HEADER.match(first):
+                year = MONTH_HEADER.match(first).group(1)
+            elif year and isinstance(first, str) and DATE_CELL.match(first):
+                day = datetime.strptime(f"{first}-{year}", "%d-%b-%Y").date()
+                text = row[events_col]
+                if text:
+                    events = schedule_events(text)
+                    merged_events, merged_until = events, merges.get(row_number, row_number)
+                elif row_number <= merged_until:
+                    events = merged_events  # Continuation of a multi-day event
+                else:
+                    events = []
+                yield day, events  # Empty dates still widen the master range
+            elif year and first:
+                break  # Working day breakdown below the calendar
+    finally:
+        wb.close()
+
+
+def read_calendar(path):
+    """Reads a department calendar from a project file or an exported workbook."""
+    return read_workbook(path) if path.lower().endswith(".xlsx") else read_project(path)
+
+
+def merge_day(day, entries):
+    """Applies the precedence rules to the events of one date.
+
+    entries is a list of (department, events). Holidays override working events: if any department
+    has a holiday on the date, the working events of every department are dropped. The same event
+    from several departments is kept once. Returns (events, conflicts).
+    """
+    holidays = [event for _, events in entries for event in events if is_holiday_text(event)]
+    kept = []
+    conflicts = []
+    for department, events in entries:
+        for event in events:
+            if holidays and not is_holiday_text(event):
+                conflicts.append([day.isoformat(), department, event, "Overridden by holiday", " | ".join(dict.fromkeys(holidays))])
+            elif event not in kept:
+                kept.append(event)
+    return kept, conflicts
+
+
+def tagged(reader, index):
+    """Yields (date, index, events) for each date of a calendar reader, so merged dates remember their department."""
+    for day, events in reader:
+        yield day, index, events
+
+
+def merge_calendars(paths, output_path, report_path):
+    """Merges department calendars into a master project file and writes the conflicts to a CSV report.
+
+    The calendars are read in date order and merged one date at a time. A project file holds only its
+    current date in memory; a workbook also holds the row ranges of its multi-day events (see
+    event_merges()), so memory grows with departments x multi-day events, not with the calendar
+    length. Returns the number of conflicts.
+    """
+    readers = [read_calendar(path) for path in paths]
+    departments = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    headers = [next(reader) for reader in readers]
+    conflict_count = 0
+
+    with open(report_path, "w", newline="", encoding="utf-8") as report_file:
+        report = csv.writer(report_file)
+        report.writerow(["Date", "Department", "Event", "Conflict", "Kept instead"])
+
+        # Semester dates come from the first department that has them; differing dates are reported
+        semesters = {}
+        for department, header in zip(departments, headers):
+            for name, dates in header["semesters"].items():
+                semesters.setdefault(name, dates)
+                if semesters[name] != dates:
+                    report.writerow(["", department, name, "Different semester dates",
+                                     f"{semesters[name][0].isoformat()} to {semesters[name][1].isoformat()}"])
+                    conflict_count += 1
+
+        # The range is only known once every date has been read, so the dates go to a temporary file first
+        start = min((header["start"] for header in headers if header["start"]), default=None)
+        end = max((header["end"] for header in headers if header["end"]), default=None)
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as body:
+            streams = [tagged(reader, index) for index, reader in enumerate(readers)]
+            for day, group in groupby(heapq.merge(*streams), key=lambda item: item[0]):
+                events, conflicts = merge_day(day, [(departments[index], events) for _, index, events in group])
+                report.writerows(conflicts)
+                conflict_count += len(conflicts)
+                if events:
+                    body.write(project_line(day, events))
+                start = min(start or day, day)
+                end = max(end or day, day)
+
+            body.seek(0)
+            with open(output_path, "w", encoding="utf-8") as output_file:
+                output_file.write(project_header(start, end, semesters))
+                shutil.copyfileobj(body, output_file)
+
+    return conflict_count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Merge department calendars (.calproj project files or exported .xlsx workbooks) into a master calendar.")
+    arg_parser.add_argument("calendars", nargs="+", help="department calendars to merge")
+    arg_parser.add_argument("-o", "--output", default="master.calproj", help="master project file to write (default: %(default)s)")
+    arg_parser.add_argument("-r", "--report", default="conflicts.csv", help="conflict report to write (default: %(default)s)")
+    arg_parser.add_argument("--xlsx", help="also export the master calendar to this Excel file")
+    args = arg_parser.parse_args()
+
+    conflict_count = merge_calendars(args.calendars, args.output, args.report)
+    print(f"Merged {len(args.calendars)} calendars into {args.output} ({conflict_count} conflicts, see {args.report})")
+
+    if args.xlsx:
+        from calendar_export import export_bytes
+        from calendar_model import CalendarModel, project_ops
+
+        model = CalendarModel()
+        for op in project_ops(args.output):
+            model.apply(op)
+        with open(args.xlsx, "wb") as excel_file:
+            excel_file.write(export_bytes(model))
+        print(f"Exported the master calendar to {args.xlsx}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,530 @@
+# Calendar data model shared by the desktop window and the local calendar service
+from array import array  # For compact per-date event ID lists
+from bisect import bisect_left, bisect_right  # For searching cumulative working day counts
+from datetime import date, datetime, timedelta  # For date manipulation
+from itertools import accumulate  # For cumulative working day counts
+import json  # For project files
+
+DATE_FORMAT = "%d/%m/%y"  # Format used to display dates in the app
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]  # Days that can be working days
+DAY_NAMES = WEEKDAYS + ["Sunday"]  # Day names in date.weekday() order
+SEMESTERS = ["UG-S1", "UG-S3", "UG-S5", "UG-S7", "PG-S1", "PG-S3"]  # Semesters tracked by the calendar
+WRAP_WIDTH = 50  # Schedule text is wrapped every 50 characters for display
+PROJECT_FILETYPES = [("Calendar projects", "*.calproj")]  # File dialog filter for project files
+
+# Festivals that are holidays even when not marked "(Holiday)"
+HOLIDAY_EVENTS = [
+    'Sree Krishna Janmashtami',
+    'Ganesh Chaturthi',
+    'Deepavali'
+]
+
+
+class VersionConflict(Exception):
+    """Raised when an edit was made against an outdated version of the calendar."""
+
+    def __init__(self, expected, current):
+        super().__init__(f"Calendar was changed by someone else (expected version {expected}, current version {current})")
+        self.expected = expected
+        self.current = current
+
+
+def parse_date(value):
+    """Converts an ISO date string, datetime or date into a date object."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def day_span(start, end):
+    """Yields every date from start to end, both included; nothing if start is after end."""
+    current_date = start
+    while current_date <= end:
+        yield current_date
+        current_date += timedelta(days=1)
+
+
+def weekday_index(weekday):
+    """Converts a day name ("Monday") or a weekday number (0 for Monday) into a weekday number."""
+    if isinstance(weekday, int) and 0 <= weekday <= 6:
+        return weekday
+    if isinstance(weekday, str) and weekday.capitalize() in DAY_NAMES:
+        return DAY_NAMES.index(weekday.capitalize())
+    raise ValueError(f"Unknown weekday: {weekday}")
+
+
+def saturday_number(day):
+    """Returns which Saturday of the month the given date is."""
+    return (day.day - 1) // 7 + 1
+
+
+def is_even_saturday(day):
+    """Returns True for the 2nd and 4th Saturdays of a month, which are holidays."""
+    return day.weekday() == 5 and saturday_number(day) % 2 == 0
+
+
+def is_holiday_text(text):
+    """Returns True if an event or schedule text marks a holiday."""
+    return "Holiday" in text or any(holiday in text for holiday in HOLIDAY_EVENTS)
+
+
+def base_schedule(day):
+    """Returns the default schedule text of a date (Sundays and numbered Saturdays)."""
+    if day.weekday() == 6:  # Sunday
+        return "Sunday"
+    if day.weekday() == 5:  # Saturday
+        number = saturday_number(day)
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(number, 'th')
+        text = f"{number}{suffix} Saturday"
+        if is_even_saturday(day):
+            text += " : Holiday"
+        return text
+    return ""
+
+
+class StringTable:
+    """Stores each distinct string once and hands out small integer IDs for it.
+
+    Strings are reference counted: every intern() takes a reference and every release()
+    drops one. A string without references leaves the table and its ID is reused.
+    """
+
+    def __init__(self):
+        self.strings = []  # ID -> string, None for free IDs
+        self.counts = []  # ID -> number of references
+        self.ids = {}  # String -> ID
+        self.free = []  # IDs to reuse
+
+    def intern(self, text):
+        """Returns the ID of a string, adding it to the table if needed, and takes a reference to it."""
+        string_id = self.ids.get(text)
+        if string_id is None:
+            if self.free:
+                string_id = self.free.pop()
+                self.strings[string_id] = text
+            else:
+                string_id = len(self.strings)
+                self.strings.append(text)
+                self.counts.append(0)
+            self.ids[text] = string_id
+        self.counts[string_id] += 1
+        return string_id
+
+    def release(self, string_id):
+        """Drops a reference to a string; returns True if that was the last one and the string left the table."""
+        self.counts[string_id] -= 1
+        if self.counts[string_id]:
+            return False
+        del self.ids[self.strings[string_id]]
+        self.strings[string_id] = None
+        self.free.append(string_id)
+        return True
+
+    def __getitem__(self, string_id):
+        return self.strings[string_id]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class CalendarModel:
+    """Holds the calendar range, semester dates and events, and keeps working day summaries up to date.
+
+    Every change goes through apply(), which bumps the version and notifies the listeners,
+    so the desktop window and the calendar service stay in sync with the same data.
+    """
+
+    def __init__(self):
+        self.start = None  # First date of the calendar
+        self.end = None  # Last date of the calendar
+        self.semesters = {}  # Semester name -> (start date, end date)
+        self.strings = StringTable()  # Every event name and schedule text in use, stored once
+        self.events = {}  # Date -> array of event IDs on that date, each holding a reference
+        self.history = []  # Stack of (dates, event ID, author) additions, used by "Clear Last Event"
+        self.version = 0  # Incremented on every change
+        self.listeners = []  # Callbacks notified after every change
+        self._working = {}  # Date -> whether it is a working day
+        self._schedule_ids = {}  # Date -> ID of its schedule text (holding a reference), dropped when the date changes
+        self._wrapped = {}  # Schedule text ID -> wrapped display text, dropped with the schedule text
+        self._summary = None  # Cached working days summary, dropped when a working day flag or the range changes
+        self._prefix = None  # Cached (flags, cumulative counts, counts per weekday), patched when a flag flips
+
+    # Queries
+
+    def days(self):
+        """Yields every date in the calendar range."""
+        if self.start is not None:
+            yield from day_span(self.start, self.end)
+
+    def __contains__(self, day):
+        return self.start is not None and self.start <= day <= self.end
+
+    def day_events(self, day):
+        """Returns the events added to a date, oldest first."""
+        return [self.strings[event_id] for event_id in self.events.get(day, ())]
+
+    def schedule_id(self, day):
+        """Returns the ID of a date's schedule text; dates with the same text share the same ID."""
+        schedule_id = self._schedule_ids.get(day)
+        if schedule_id is None:
+            parts = [base_schedule(day)] + self.day_events(day)
+            schedule_id = self._schedule_ids[day] = self.strings.intern(" | ".join(part for part in parts if part))
+        return schedule_id
+
+    def schedule_text(self, day):
+        """Returns the schedule text of a date."""
+        return self.strings[self.schedule_id(day)]
+
+    def display_text(self, day):
+        """Returns the schedule text of a date wrapped every WRAP_WIDTH characters, as shown in the calendar view."""
+        schedule_id = self.schedule_id(day)
+        text = self._wrapped.get(schedule_id)
+        if text is None:
+            text = self.strings[schedule_id]
+            if len(text) > WRAP_WIDTH:
+                text = '\n'.join(text[i:i + WRAP_WIDTH] for i in range(0, len(text), WRAP_WIDTH))
+            self._wrapped[schedule_id] = text
+        return text
+
+    def is_working_day(self, day):
+        """Returns True if the date is neither a Sunday nor marked as a holiday."""
+        return self._working.get(day, False)
+
+    def last_addition(self, author=None):
+        """Returns the index in history of the latest event added by author, or None.
+
+        Authors are the client IDs sent with shared edits; edits made without one have author None.
+        """
+        for index in range(len(self.history) - 1, -1, -1):
+            if self.history[index][2] == author:
+                return index
+        return None
+
+    def working_days_by_weekday(self):
+        """Returns the working days grouped by weekday (Monday to Saturday) with counts."""
+        if self._summary is None:
+            summary = {day: {"dates": [], "count": 0} for day in WEEKDAYS}
+            for day in self.days():
+                if self._working[day]:
+                    data = summary[WEEKDAYS[day.weekday()]]
+                    data["dates"].append(day.strftime(DATE_FORMAT))
+                    data["count"] += 1
+            self._summary = summary
+        return self._summary
+
+    def semester_working_days(self):
+        """Returns the number of working days of each semester inside the calendar range."""
+        return {name: self.working_days_between(start, end) for name, (start, end) in self.semesters.items()}
+
+    def working_days_between(self, start, end, weekday=None, semester=None):
+        """Returns the number of working days from start to end, both included, in constant time.
+
+        weekday limits the count to one day of the week ("Monday" or 0 to 6) and semester to the
+        dates of one semester. Dates outside the calendar range are not counted.
+        """
+        start, end = parse_date(start), parse_date(end)
+        if semester is not None:
+            if semester not in self.semesters:
+                raise ValueError(f"Unknown semester: {semester}")
+            sem_start, sem_end = self.semesters[semester]
+            start, end = max(start, sem_start), min(end, sem_end)
+        counts = self.prefix_sums(weekday)
+        if self.start is None:
+            return 0
+        start, end = max(start, self.start), min(end, self.end)
+        if start > end:
+            return 0
+        return counts[(end - self.start).days + 1] - counts[(start - self.start).days]
+
+    def end_date_range(self, start, min_days=0, weekday_minimums=None, max_days=None):
+        """Returns the (earliest, latest) end dates meeting the working day targets of a semester starting on start.
+
+        The semester needs at least min_days working days, and at least weekday_minimums[day] working
+        days on each given day of the week; with max_days it may not have more than that. Every end date
+        between earliest and latest meets the targets. Returns None if no date in the calendar range does.
+        """
+        start = parse_date(start)
+        if self.start is None or not self.start <= start <= self.end:
+            raise ValueError("The semester start must be inside the calendar range.")
+        first = (start - self.start).days  # Index of the start date in the cumulative counts
+        targets = [(self.prefix_sums(), min_days)]
+        targets += [(self.prefix_sums(day), minimum) for day, minimum in (weekday_minimums or {}).items()]
+
+        # Counts only grow with the end date, so the first index reaching each target is found by bisection
+        earliest = first
+        for counts, minimum in targets:
+            earliest = max(earliest, bisect_left(counts, counts[first] + minimum, first + 1) - 1)
+        latest = len(self.prefix_sums()) - 2  # Index of the last date in the range
+        if max_days is not None:
+            total = self.prefix_sums()
+            latest = bisect_right(total, total[first] + max_days, first + 1) - 2
+        if earliest > latest:
+            return None
+        return self.start + timedelta(days=earliest), self.start + timedelta(days=latest)
+
+    def earliest_end_date(self, start, min_days=0, weekday_minimums=None):
+        """Returns the first end date giving a semester starting on start its working day targets, or None."""
+        dates = self.end_date_range(start, min_days, weekday_minimums)
+        return dates[0] if dates else None
+
+    def prefix_sums(self, weekday=None):
+        """Returns the cumulative working day counts of the range; entry i counts the first i dates.
+
+        With a weekday only working days on that day of the week are counted.
+        """
+        if self._prefix is None:
+            flags = [int(self._working[day]) for day in self.days()]
+            total = array('I', accumulate(flags, initial=0))
+            self._prefix = (flags, total, [self._weekday_sums(flags, index) for index in range(len(DAY_NAMES))])
+        _, total, by_weekday = self._prefix
+        return total if weekday is None else by_weekday[weekday_index(weekday)]
+
+    def snapshot(self):
+        """Returns the whole calendar as JSON friendly data."""
+        return {
+            "version": self.version,
+            "start": self.start.isoformat() if self.start else None,
+            "end": self.end.isoformat() if self.end else None,
+            "semesters": {name: [start.isoformat(), end.isoformat()] for name, (start, end) in self.semesters.items()},
+            "events": {day.isoformat(): self.day_events(day) for day in sorted(self.events)},
+            "history": [[[day.isoformat() for day in dates], self.strings[event_id], author] for dates, event_id, author in self.history],
+        }
+
+    # Changes
+
+    def subscribe(self, callback):
+        """Registers a callback called with a change dictionary after every change."""
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """Removes a callback registered with subscribe()."""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def apply(self, op, version=None):
+        """Applies an edit operation and returns the change sent to the listeners.
+
+        If a version is given and the calendar has moved on since, VersionConflict is raised
+        and nothing is changed. Invalid operations raise ValueError.
+        """
+        if version is not None and version != self.version:
+            raise VersionConflict(version, self.version)
+        handler = getattr(self, "_op_" + str(op.get("op")), None)
+        if handler is None:
+            raise ValueError(f"Unknown calendar operation: {op.get('op')}")
+        dates = handler(op)
+        self.version += 1
+        change = {"version": self.version, "op": op, "dates": [day.isoformat() for day in dates]}
+        self._notify(change)
+        return change
+
+    def load(self, snapshot):
+        """Replaces the whole calendar with a snapshot returned by snapshot()."""
+        self.start = parse_date(snapshot["start"]) if snapshot.get("start") else None
+        self.end = parse_date(snapshot["end"]) if snapshot.get("end") else None
+        self.semesters = {name: (parse_date(start), parse_date(end)) for name, (start, end) in snapshot.get("semesters", {}).items()}
+        self.strings = StringTable()
+        self.events = {parse_date(day): array('I', map(self.strings.intern, events)) for day, events in snapshot.get("events", {}).items()}
+        self.history = [([parse_date(day) for day in entry[0]], self.strings.intern(entry[1]), entry[2] if len(entry) > 2 else None)
+                        for entry in snapshot.get("history", [])]
+        self.version = snapshot.get("version", 0)
+        self._schedule_ids = {}
+        self._wrapped = {}
+        self._working = {day: self._compute_working(day) for day in self.days()}
+        self._drop_counts()
+        self._notify({"version": self.version, "op": {"op": "load"}, "dates": []})
+
+    def _notify(self, change):
+        for callback in list(self.listeners):
+            callback(change)
+
+    def _drop_schedule(self, day):
+        """Forgets the cached schedule text of a changed date."""
+        schedule_id = self._schedule_ids.pop(day, None)
+        if schedule_id is not None:
+            self._release(schedule_id)
+
+    def _release(self, string_id):
+        """Drops a reference to an interned string, and its wrapped text once the string leaves the table."""
+        if self.strings.release(string_id):
+            self._wrapped.pop(string_id, None)
+
+    def _compute_working(self, day):
+        return day.weekday() != 6 and not is_holiday_text(self.schedule_text(day))
+
+    def _weekday_sums(self, flags, weekday):
+        """Returns the cumulative counts of the working day flags on one day of the week."""
+        first = (weekday - self.start.weekday()) % 7 if self.start else 0  # The weekday's dates are every 7th from here
+        counted = [0] * len(flags)
+        counted[first::7] = flags[first::7]
+        return array('I', accumulate(counted, initial=0))
+
+    def _drop_counts(self):
+        """Forgets the cached working day summary and cumulative counts."""
+        self._summary = None
+        self._prefix = None
+
+    def _update_working(self, day):
+        """Recomputes the working day flag of a changed date and patches the cached counts if it flipped."""
+        working = self._compute_working(day)
+        if self._working.get(day) == working:
+            return
+        self._working[day] = working
+        self._summary = None
+        if self._prefix is not None:
+            flags, total, by_weekday = self._prefix
+            index = (day - self.start).days
+            flags[index] = int(working)
+            total[index + 1:] = array('I', accumulate(flags[index:], initial=total[index]))[1:]
+            by_weekday[day.weekday()] = self._weekday_sums(flags, day.weekday())
+
+    def _op_set_range(self, op):
+        start, end = parse_date(op["start"]), parse_date(op["end"])
+        if start > end:
+            raise ValueError("Start date cannot be after end date.")
+        old_start, old_end = self.start, self.end
+        self.start, self.end = start, end
+        # Events outside the new range are dropped, the rest are kept
+        for day in [day for day in self.events if not start <= day <= end]:
+            for event_id in self.events.pop(day):
+                self._release(event_id)
+        history = []
+        for entry in self.history:
+            if any(start <= day <= end for day in entry[0]):
+                history.append(entry)
+            else:
+                self._release(entry[1])
+        self.history = history
+        for day in [day for day in self._schedule_ids if not start <= day <= end]:
+            self._drop_schedule(day)
+        # Only the dates entering or leaving the range changed
+        if old_start is None or start > old_end or end < old_start:
+            changed = sorted(set(day_span(old_start, old_end) if old_start else ()) | set(self.days()))
+        else:
+            one_day = timedelta(days=1)
+            changed = (list(day_span(min(start, old_start), max(start, old_start) - one_day)) +
+                       list(day_span(min(end, old_end) + one_day, max(end, old_end))))
+        for day in changed:
+            if day in self:
+                self._working[day] = self._compute_working(day)
+            else:
+                self._working.pop(day, None)
+        if changed:
+            self._drop_counts()  # The counts are indexed from the start of the range
+        return changed
+
+    def _op_set_semesters(self, op):
+        semesters = {}
+        for name, (start, end) in op["semesters"].items():
+            start, end = parse_date(start), parse_date(end)
+            if start > end:
+                raise ValueError(f"{name} starts after it ends.")
+            semesters[name] = (start, end)
+        self.semesters = semesters
+        return []
+
+    def _op_add_event(self, op):
+        event = op.get("event", "").strip()
+        if not event:
+            raise ValueError("Please enter an event name.")
+        dates = sorted({parse_date(day) for day in op["dates"]})
+        dates = [day for day in dates if day in self]
+        if not dates:
+            raise ValueError("Invalid date selected")
+        for day in dates:
+            self.events.setdefault(day, array('I')).append(self.strings.intern(event))
+            self._drop_schedule(day)
+            self._update_working(day)
+        self.history.append((dates, self.strings.intern(event), op.get("author")))
+        return dates
+
+    def _op_remove_last_event(self, op):
+        # Only the author's own latest event is removed, so shared editors do not undo each other's work
+        index = self.last_addition(op.get("author"))
+        if index is None:
+            raise ValueError("No events to clear.")
+        dates, event_id, _ = self.history.pop(index)
+        for day in dates:
+            events = self.events.get(day, array('I'))
+            if event_id in events:
+                # Remove the most recent occurrence of the event
+                del events[len(events) - 1 - events[::-1].index(event_id)]
+                self._release(event_id)
+            if not events:
+                self.events.pop(day, None)
+            self._drop_schedule(day)
+            if day in self:
+                self._update_working(day)
+        self._release(event_id)  # The history entry's reference
+        return [day for day in dates if day in self]
+
+    def _op_clear(self, op):
+        self.start = None
+        self.end = None
+        self.semesters = {}
+        self.strings = StringTable()
+        self.events = {}
+        self.history = []
+        self._working = {}
+        self._schedule_ids = {}
+        self._wrapped = {}
+        self._drop_counts()
+        return []
+
+
+def project_header(start, end, semesters):
+    """Returns the first line of a project file."""
+    return json.dumps({
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "semesters": {name: [parse_date(sem_start).isoformat(), parse_date(sem_end).isoformat()] for name, (sem_start, sem_end) in semesters.items()},
+    }) + "\n"
+
+
+def project_line(day, events):
+    """Returns the project file line holding the events of one date."""
+    return json.dumps({"date": day.isoformat(), "events": list(events)}) + "\n"
+
+
+def write_project(model, path):
+    """Saves the calendar as a project file: a header line with the range and semesters, then one line per date with events."""
+    with open(path, "w", encoding="utf-8") as project_file:
+        project_file.write(project_header(model.start, model.end, model.semesters))
+        for day in sorted(model.events):
+            project_file.write(project_line(day, model.day_events(day)))
+
+
+def read_project(path):
+    """Reads a project file line by line; yields the header first, then (date, events) in date order."""
+    with open(path, encoding="utf-8") as project_file:
+        header = json.loads(project_file.readline() or "{}")
+        yield {
+            "start": parse_date(header["start"]) if header.get("start") else None,
+            "end": parse_date(header["end"]) if header.get("end") else None,
+            "semesters": {name: (parse_date(start), parse_date(end)) for name, (start, end) in header.get("semesters", {}).items()},
+        }
+        for line in project_file:
+            if line.strip():
+                entry = json.loads(line)
+                yield parse_date(entry["date"]), entry["events"]
+
+
+def project_ops(path):
+    """Returns the operations that rebuild a saved project in a cleared calendar."""
+    days = read_project(path)
+    header = next(days)
+    if header["start"] is None:
+        return []
+    ops = [
+        {"op": "set_range", "start": header["start"].isoformat(), "end": header["end"].isoformat()},
+        {"op": "set_semesters", "semesters": {name: [start.isoformat(), end.isoformat()] for name, (start, end) in header["semesters"].items()}},
+    ]
+    # One operation per event with all its dates, so "Clear Last Event" removes a whole event
+    dates_by_event = {}
+    for day, events in days:
+        for event in events:
+            dates_by_event.setdefault(event, []).append(day.isoformat())
+    ops += [{"op": "add_event", "dates": dates, "event": event} for event, dates in dates_by_event.items()]
+    return ops
@@ -0,0 +1,129 @@
+# Calendar policy rules, checked incrementally as the calendar changes
+import json  # For reading policy files
+
+from calendar_model import DATE_FORMAT, is_even_saturday, is_holiday_text, parse_date  # Calendar helpers
+
+# Rules of a typical academic calendar. "rule" names one of the checks in RULES; the other
+# keys are its parameters.
+POLICY = [
+    {"rule": "even_saturdays_off"},
+    {"rule": "min_instruction_days", "days": 90},
+    {"rule": "no_exams_on_holidays", "keywords": ["exam"]},
+]
+
+
+def even_saturdays_off(model, day, rule):
+    """2nd and 4th Saturdays are holidays, so they should not have working events."""
+    if is_even_saturday(day):
+        events = [event for event in model.day_events(day) if not is_holiday_text(event)]
+        if events:
+            return f"Event on a holiday Saturday: {' | '.join(events)}"
+    return None
+
+
+def no_exams_on_holidays(model, day, rule):
+    """Exams should not be scheduled on Sundays or holidays."""
+    if not model.is_working_day(day):
+        keywords = [keyword.lower() for keyword in rule.get("keywords", ["exam"])]
+        exams = [event for event in model.day_events(day) if any(keyword in event.lower() for keyword in keywords)]
+        if exams:
+            return f"Exam on a holiday: {' | '.join(exams)}"
+    return None
+
+
+def min_instruction_days(model, semester, rule):
+    """Every semester needs a minimum number of working days."""
+    start, end = model.semesters[semester]
+    count = model.working_days_between(start, end)
+    if count < rule.get("days", 0):
+        return f"{count} instruction days, at least {rule['days']} needed"
+    return None
+
+
+# Rule name -> (scope, check). Day checks return a message for one date, semester checks for one semester.
+RULES = {
+    "even_saturdays_off": ("day", even_saturdays_off),
+    "no_exams_on_holidays": ("day", no_exams_on_holidays),
+    "min_instruction_days": ("semester", min_instruction_days),
+}
+
+
+def load_policy(path):
+    """Reads a policy saved as a JSON list of rules in the POLICY format."""
+    with open(path, encoding="utf-8") as policy_file:
+        policy = json.load(policy_file)
+    for rule in policy:
+        if rule.get("rule") not in RULES:
+            raise ValueError(f"Unknown policy rule: {rule}")
+    return policy
+
+
+class PolicyChecker:
+    """Keeps the policy violations of the calendar up to date with the model.
+
+    Violations are stored per (rule, date) and (rule, semester), so an event edit only re-checks
+    the day rules of the edited dates and the semester rules of the semesters containing them.
+    Range changes re-check the dates entering or leaving the range and the semester rules;
+    semester changes re-check the semester rules. Clearing or loading re-checks everything.
+    """
+
+    def __init__(self, model, policy=POLICY):
+        for rule in policy:
+            if rule.get("rule") not in RULES:
+                raise ValueError(f"Unknown policy rule: {rule}")
+        self.model = model
+        self.policy = policy
+        self.day_rules = [(index, rule, RULES[rule["rule"]][1]) for index, rule in enumerate(policy) if RULES[rule["rule"]][0] == "day"]
+        self.semester_rules = [(index, rule, RULES[rule["rule"]][1]) for index, rule in enumerate(policy) if RULES[rule["rule"]][0] == "semester"]
+        self.violations = {}  # (rule index, date or semester name) -> message
+        self.check_all()
+        model.subscribe(self.refresh)
+
+    def check_all(self):
+        """Checks every rule against the whole calendar."""
+        self.violations = {}
+        for day in self.model.days():
+            self._check_day(day)
+        self._check_semesters(self.model.semesters)
+
+    def refresh(self, change):
+        """Model listener: re-checks only what the change can affect."""
+        op = change["op"]["op"]
+        if op in ("add_event", "remove_last_event"):
+            days = [parse_date(day) for day in change["dates"]]
+            for day in days:
+                self._check_day(day)
+            self._check_semesters([name for name, (start, end) in self.model.semesters.items()
+                                   if any(start <= day <= end for day in days)])
+        elif op == "set_range":
+            for day in change["dates"]:
+                self._check_day(parse_date(day))  # Dates that left the range lose their violations
+            self._check_semesters(self.model.semesters)  # Semester counts only include dates in the range
+        elif op == "set_semesters":
+            self.violations = {key: message for key, message in self.violations.items() if not isinstance(key[1], str)}
+            self._check_semesters(self.model.semesters)
+        else:
+            self.check_all()
+
+    def _check_day(self, day):
+        for index, rule, check in self.day_rules:
+            message = check(self.model, day, rule) if day in self.model else None
+            if message:
+                self.violations[index, day] = message
+            else:
+                self.violations.pop((index, day), None)
+
+    def _check_semesters(self, semesters):
+        for index, rule, check in self.semester_rules:
+            for semester in semesters:
+                message = check(self.model, semester, rule)
+                if message:
+                    self.violations[index, semester] = message
+                else:
+                    self.violations.pop((index, semester), None)
+
+    def messages(self):
+        """Returns the violations as text lines: semesters first, then dates in order."""
+        semester_lines = sorted(f"{key}: {message}" for (_, key), message in self.violations.items() if isinstance(key, str))
+        day_items = sorted((key, index, message) for (index, key), message in self.violations.items() if not isinstance(key, str))
+        return semester_lines + [f"{day.strftime(DATE_FORMAT)}: {message}" for day, _, message in day_items]
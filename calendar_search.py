@@ -0,0 +1,124 @@
+# Event search: inverted index from words to dates, with next and previous occurrence lookups
+import re  # For splitting events into words
+from bisect import bisect_left, bisect_right, insort  # For sorted date lists
+from datetime import date  # For date manipulation
+
+from calendar_model import parse_date  # For reading change notifications
+
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Returns the lowercase words of a text."""
+    return WORD.findall(text.lower())
+
+
+class EventIndex:
+    """Keeps an inverted index of the calendar events up to date with the model.
+
+    Every word of every event maps to the sorted ordinals of the dates it appears on, and the
+    dates with events and the holidays are kept as sorted ordinal lists, so searches and
+    next/previous occurrence lookups are binary searches. Event edits only reindex the edited
+    dates and range changes the dates entering or leaving the range; clearing or loading the
+    calendar rebuilds the index.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.postings = {}  # Word -> sorted day ordinals
+        self.words = []  # Sorted words, for prefix searches
+        self.day_words = {}  # Day ordinal -> words on that date
+        self.event_days = []  # Sorted ordinals of dates with events
+        self.holidays = []  # Sorted ordinals of holidays (non-working days other than Sundays)
+        self.rebuild()
+        model.subscribe(self.refresh)
+
+    def rebuild(self):
+        """Indexes the whole calendar."""
+        self.postings = {}
+        self.words = []
+        self.day_words = {}
+        self.event_days = []
+        self.holidays = []
+        for day in self.model.days():
+            self._index_day(day)
+
+    def refresh(self, change):
+        """Model listener: reindexes the changed dates, or everything when the calendar was cleared or loaded."""
+        if change["op"]["op"] in ("add_event", "remove_last_event", "set_range"):
+            for day in change["dates"]:
+                day = parse_date(day)
+                self._unindex_day(day)
+                self._index_day(day)
+        elif change["op"]["op"] != "set_semesters":
+            self.rebuild()
+
+    def _index_day(self, day):
+        ordinal = day.toordinal()
+        words = set(tokenize(" ".join(self.model.day_events(day))))
+        if words:
+            self.day_words[ordinal] = words
+            insort(self.event_days, ordinal)
+        for word in words:
+            if word not in self.postings:
+                self.postings[word] = []
+                insort(self.words, word)
+            insort(self.postings[word], ordinal)
+        if day.weekday() != 6 and day in self.model and not self.model.is_working_day(day):
+            insort(self.holidays, ordinal)
+
+    def _unindex_day(self, day):
+        ordinal = day.toordinal()
+        for word in self.day_words.pop(ordinal, ()):
+            postings = self.postings[word]
+            del postings[bisect_left(postings, ordinal)]
+            if not postings:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+        for ordinals in (self.event_days, self.holidays):
+            index = bisect_left(ordinals, ordinal)
+            if index < len(ordinals) and ordinals[index] == ordinal:
+                del ordinals[index]
+
+    def _matching_ordinals(self, query):
+        """Returns the sorted ordinals of dates whose events contain every word of the query.
+
+        The last word also matches longer words starting with it, so partly typed queries work.
+        """
+        words = tokenize(query)
+        if not words:
+            return self.event_days
+        results = [self.postings.get(word, []) for word in words[:-1]]
+        # Dates of every word starting with the last query word
+        start = bisect_left(self.words, words[-1])
+        end = bisect_left(self.words, words[-1] + "\uffff")  # Just past every word with that prefix
+        if end - start == 1:
+            results.append(self.postings[self.words[start]])
+        else:
+            results.append(sorted({ordinal for word in self.words[start:end] for ordinal in self.postings[word]}))
+        results.sort(key=len)
+        matches = results[0]
+        for postings in results[1:]:
+            matches = [ordinal for ordinal in matches if self._contains(postings, ordinal)]
+        return matches
+
+    @staticmethod
+    def _contains(ordinals, ordinal):
+        index = bisect_left(ordinals, ordinal)
+        return index < len(ordinals) and ordinals[index] == ordinal
+
+    def search(self, query):
+        """Returns the dates whose events match the query, in date order."""
+        return [date.fromordinal(ordinal) for ordinal in self._matching_ordinals(query)]
+
+    def next_occurrence(self, query="", after=None, holiday=False):
+        """Returns the first date after `after` (default today) with an event matching the query, or the next holiday."""
+        ordinals = self.holidays if holiday else self._matching_ordinals(query)
+        index = bisect_right(ordinals, (after or date.today()).toordinal())
+        return date.fromordinal(ordinals[index]) if index < len(ordinals) else None
+
+    def previous_occurrence(self, query="", before=None, holiday=False):
+        """Returns the last date before `before` (default today) with an event matching the query, or the last holiday."""
+        ordinals = self.holidays if holiday else self._matching_ordinals(query)
+        index = bisect_left(ordinals, (before or date.today()).toordinal())
+        return date.fromordinal(ordinals[index - 1]) if index > 0 else None
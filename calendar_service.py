@@ -0,0 +1,282 @@
+# Local HTTP service that lets several people edit the same calendar at once
+import argparse  # For command line options
+import asyncio  # For serving many editors from a single process
+import json  # For request and response bodies
+import threading  # For listening to changes without blocking the window
+import time  # For reconnect delays
+import urllib.error  # For HTTP error handling in the client
+import urllib.request  # For talking to the service from the desktop window
+import uuid  # For telling the authors of shared edits apart
+from urllib.parse import parse_qs, urlsplit  # For splitting request paths and query strings
+
+from calendar_model import CalendarModel, VersionConflict  # Shared calendar data
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Edits that would silently undo someone else's change, so the client sends the version they were made against
+VERSIONED_OPS = ("set_range", "set_semesters", "clear", "remove_last_event")
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+
+
+class CalendarService:
+    """Serves a CalendarModel over HTTP.
+
+    GET /calendar, /range, /semesters, /events and /working-days read the calendar
+    (/working-days also counts working days between two dates given as query parameters),
+    POST /ops applies an edit operation and GET /subscribe streams every change as
+    server-sent events. Edits may carry the calendar version they were made against;
+    if someone else changed the calendar in the meantime the edit is refused with 409.
+    """
+
+    def __init__(self, model=None):
+        self.model = model or CalendarModel()
+        self.subscribers = set()  # One queue per connected /subscribe stream
+        self._responses = {}  # Route -> (version, encoded response), so reads are only rebuilt after a change
+        self.model.subscribe(self._broadcast)
+        self.routes = {
+            ("GET", "/calendar"): self.get_calendar,
+            ("GET", "/range"): self.get_range,
+            ("GET", "/semesters"): self.get_semesters,
+            ("GET", "/events"): self.get_events,
+            ("GET", "/working-days"): self.get_working_days,
+            ("POST", "/ops"): self.post_op,
+        }
+
+    # Routes
+
+    def get_calendar(self, body, query):
+        return 200, self._cached("calendar", self.model.snapshot)
+
+    def get_range(self, body, query):
+        model = self.model
+        return 200, {
+            "version": model.version,
+            "start": model.start.isoformat() if model.start else None,
+            "end": model.end.isoformat() if model.end else None,
+        }
+
+    def get_semesters(self, body, query):
+        semesters = {name: [start.isoformat(), end.isoformat()] for name, (start, end) in self.model.semesters.items()}
+        return 200, {"version": self.model.version, "semesters": semesters}
+
+    def get_events(self, body, query):
+        return 200, self._cached("events", lambda: {
+            "version": self.model.version,
+            "events": {day.isoformat(): self.model.day_events(day) for day in sorted(self.model.events)},
+        })
+
+    def get_working_days(self, body, query):
+        if "start" in query or "end" in query:
+            # Count for a date range, e.g. /working-days?start=2024-09-16&end=2024-11-22&semester=UG-S3&weekday=Monday
+            try:
+                count = self.model.working_days_between(
+                    query.get("start", self.model.start), query.get("end", self.model.end),
+                    weekday=query.get("weekday"), semester=query.get("semester"),
+                )
+            except (TypeError, ValueError) as e:
+                return 400, {"error": str(e)}
+            return 200, {"version": self.model.version, "count": count}
+        return 200, {
+            "version": self.model.version,
+            "by_weekday": self.model.working_days_by_weekday(),
+            "by_semester": self.model.semester_working_days(),
+        }
+
+    def post_op(self, body, query):
+        if not isinstance(body, dict) or not isinstance(body.get("op"), dict):
+            return 400, {"error": "Expected a JSON object with an 'op' object."}
+        try:
+            change = self.model.apply(body["op"], body.get("version"))
+        except VersionConflict as e:
+            return 409, {"error": str(e), "version": e.current}
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, {"error": str(e) or "Invalid operation."}
+        return 200, change
+
+    def _cached(self, name, build):
+        """Returns the encoded response built by build(), reusing it until the calendar changes."""
+        version, data = self._responses.get(name, (None, None))
+        if version != self.model.version:
+            data = json.dumps(build()).encode()
+            self._responses[name] = (self.model.version, data)
+        return data
+
+    # Change notifications
+
+    def _broadcast(self, change):
+        message = json.dumps(change)
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A subscriber that cannot keep up is dropped; it resyncs when it reconnects
+                self.subscribers.discard(queue)
+
+    async def _stream(self, writer):
+        queue = asyncio.Queue(maxsize=1000)
+        self.subscribers.add(queue)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        writer.write(f"event: hello\ndata: {json.dumps({'version': self.model.version})}\n\n".encode())
+        try:
+            await writer.drain()
+            while queue in self.subscribers:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=15)
+                    writer.write(f"data: {message}\n\n".encode())
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")  # Comment line so dead connections get noticed
+                await writer.drain()
+        finally:
+            self.subscribers.discard(queue)
+
+    # HTTP handling
+
+    async def handle(self, reader, writer):
+        """Handles one client connection, serving requests until it is closed."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                raw_body = await reader.readexactly(int(headers.get("content-length", 0)))
+                url = urlsplit(target)
+                path = url.path.rstrip("/") or "/"
+                query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+                if method == "GET" and path == "/subscribe":
+                    await self._stream(writer)
+                    break
+
+                status, payload = self.dispatch(method, path, raw_body, query)
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # Client went away or sent a malformed request
+        finally:
+            writer.close()
+
+    def dispatch(self, method, path, raw_body, query=None):
+        """Routes a request to its handler and returns (status, payload); payload may be already encoded JSON."""
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                return 405, {"error": f"{method} is not allowed on {path}"}
+            return 404, {"error": f"Unknown path {path}"}
+        try:
+            body = json.loads(raw_body) if raw_body else None
+        except json.JSONDecodeError:
+            return 400, {"error": "Request body is not valid JSON."}
+        try:
+            return handler(body, query or {})
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Runs the service until cancelled."""
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+class CalendarClient:
+    """Connects the desktop window to a running calendar service.
+
+    The client keeps a local CalendarModel mirror. Edits are sent to the service and come
+    back through the change stream, so every window sees the changes in the same order.
+    Every edit carries the client's author ID, so "Clear Last Event" only removes this
+    client's own events.
+    """
+
+    def __init__(self, url, model=None):
+        self.url = url.rstrip("/")
+        self.model = model or CalendarModel()
+        self.author = uuid.uuid4().hex  # Identifies this client's edits
+        self.resync()
+
+    def request(self, method, path, payload=None):
+        """Sends a request to the service and returns the decoded JSON response."""
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            error = json.loads(e.read() or b"{}")
+            if e.code == 409:
+                raise VersionConflict((payload or {}).get("version"), error.get("version")) from None
+            raise ValueError(error.get("error", f"Calendar service error {e.code}")) from None
+
+    def submit(self, op, version=None):
+        """Sends an edit operation to the service and applies the resulting change to the mirror.
+
+        Operations in VERSIONED_OPS are sent with the mirror's version unless one is given, so
+        they are refused with VersionConflict if someone else changed the calendar first. Must
+        run on the window's thread, like receive().
+        """
+        if version is None and op.get("op") in VERSIONED_OPS:
+            version = self.model.version
+        change = self.request("POST", "/ops", {"op": dict(op, author=self.author), "version": version})
+        self.receive(change)  # Later edits are made against the new version, without waiting for the stream
+        return change
+
+    def resync(self):
+        """Replaces the mirror with the calendar on the service."""
+        self.model.load(self.request("GET", "/calendar"))
+
+    def listen(self, callback):
+        """Starts a background thread calling callback(change) for every change on the service."""
+
+        def run():
+            while True:
+                try:
+                    with urllib.request.urlopen(self.url + "/subscribe") as stream:
+                        callback({"op": {"op": "resync"}})  # Catch up on anything missed while disconnected
+                        for line in stream:
+                            line = line.decode().strip()
+                            if line.startswith("data: ") and "\"op\"" in line:
+                                callback(json.loads(line[6:]))
+                except (OSError, ValueError):
+                    time.sleep(2)  # Service not reachable, try again shortly
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def receive(self, change):
+        """Applies a change from the stream to the local mirror; must run on the window's thread."""
+        if change["op"]["op"] != "resync" and change["version"] == self.model.version + 1:
+            self.model.apply(change["op"])
+        elif change["op"]["op"] == "resync" or change["version"] > self.model.version:
+            self.resync()  # Missed a change, fetch everything again
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run the shared calendar service.")
+    arg_parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (default: %(default)s)")
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (default: %(default)s)")
+    args = arg_parser.parse_args()
+    print(f"Calendar service running on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(CalendarService().serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
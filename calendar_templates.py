@@ -0,0 +1,89 @@
+# Academic calendar templates: events placed relative to semester start and end dates
+import json  # For reading template files
+from bisect import bisect_left  # For finding the n-th working day
+from datetime import timedelta  # For date manipulation
+
+from calendar_model import parse_date  # For reading semester dates
+
+# Events of a typical semester. Each event is placed relative to an anchor of every semester:
+# "start" moves forward to the next working day and "end" moves back to the last working day.
+# From there "weeks" moves by whole weeks and "working_days" counts working days, so holidays
+# are skipped. "semesters" limits an event to some semesters and "holiday" marks it as a holiday.
+DEFAULT_TEMPLATE = [
+    {"event": 'Enrolment and commencement of classes for all UG and PG / commencement', "anchor": "start", "working_days": 0},
+    {"event": 'Finalisation of electives', "anchor": "start", "weeks": 1},
+    {"event": 'First Class committee meeting', "anchor": "start", "weeks": 3},
+    {"event": 'Commencement of Mid-Semester Exam', "anchor": "start", "weeks": 7},
+    {"event": 'Completion of quizzes, midsem and attendance entry in AUMS', "anchor": "start", "weeks": 9},
+    {"event": 'Missed mid semester exam', "anchor": "start", "weeks": 9, "working_days": 2},
+    {"event": 'Second class committee', "anchor": "start", "weeks": 10},
+    {"event": 'Pre-registration for next sem, course end survey, faculty feedback', "anchor": "end", "working_days": -10},
+    {"event": 'Finalisation of internals and attendance', "anchor": "end", "working_days": -2},
+    {"event": 'Last instruction day', "anchor": "end", "working_days": 0},
+    {"event": 'Commencement of end-semester exams', "anchor": "end", "working_days": 1},
+]
+
+
+def load_template(path):
+    """Reads a template saved as a JSON list of events in the DEFAULT_TEMPLATE format."""
+    with open(path, encoding="utf-8") as template_file:
+        template = json.load(template_file)
+    if not isinstance(template, list):
+        raise ValueError("A template must be a list of events")
+    for entry in template:
+        if not isinstance(entry, dict) or not entry.get("event") or entry.get("anchor", "start") not in ("start", "end"):
+            raise ValueError(f"Invalid template event: {entry}")
+    return template
+
+
+def resolve_template(model, template=DEFAULT_TEMPLATE, semesters=None):
+    """Places the template events on dates for each semester.
+
+    semesters maps names to (start, end) dates and defaults to the calendar's semesters. Every
+    event is resolved with a few binary searches on the calendar's cumulative working day counts.
+    Returns (placed, skipped): placed maps each event to its sorted dates, skipped lists the
+    (event, semester) pairs that fall outside the calendar range.
+    """
+    semesters = model.semesters if semesters is None else semesters
+    total = model.prefix_sums()  # total[i] is the number of working days in the first i dates
+    working_days = total[-1]
+    placed = {}
+    skipped = []
+
+    for entry in template:
+        event = entry["event"] + (" (Holiday)" if entry.get("holiday") else "")
+        for sem_name, (sem_start, sem_end) in semesters.items():
+            if entry.get("semesters") and sem_name not in entry["semesters"]:
+                continue
+            forward = entry.get("anchor", "start") == "start"
+            day = parse_date(sem_start if forward else sem_end) + timedelta(weeks=entry.get("weeks", 0))
+            if model.start is None or not model.start <= day <= model.end:
+                skipped.append((event, sem_name))
+                continue
+
+            # Number (counting from 1) of the working day the anchor moves to
+            index = (day - model.start).days
+            number = total[index] + 1 if forward else total[index + 1]
+            number += entry.get("working_days", 0)
+            if not 1 <= number <= working_days:
+                skipped.append((event, sem_name))
+                continue
+            day = model.start + timedelta(days=bisect_left(total, number) - 1)
+            if day not in placed.setdefault(event, []):
+                placed[event].append(day)
+
+    return {event: sorted(dates) for event, dates in placed.items()}, skipped
+
+
+def template_ops(model, template=DEFAULT_TEMPLATE, semesters=None):
+    """Returns the calendar operations adding the template events, leaving out events already on their dates.
+
+    Returns (ops, skipped) where skipped is as in resolve_template().
+    """
+    placed, skipped = resolve_template(model, template, semesters)
+    ops = []
+    for event, dates in placed.items():
+        dates = [day for day in dates if event not in model.day_events(day)]
+        if dates:
+            ops.append({"op": "add_event", "dates": [day.isoformat() for day in dates], "event": event})
+    return ops, skipped
@@ -3,16 +3,37 @@ from customtkinter import *  # CustomTkinter for enhanced tkinter widgets
 from tkinter import messagebox, filedialog, simpledialog  # Standard tkinter dialogs
 from tkcalendar import DateEntry  # Calendar widget for date selection
 from datetime import datetime, timedelta  # For date manipulation
-import openpyxl  # Library for handling Excel files
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side  # Styles for Excel cells
-from openpyxl.utils import get_column_letter  # Utility to convert column numbers to letters
+import queue  # For handing calendar service changes to the UI thread
+import sys  # For command line options
+from calendar_model import CalendarModel, VersionConflict, DATE_FORMAT, SEMESTERS, WEEKDAYS, parse_date, day_span  # Calendar data shared with the calendar service
+from calendar_model import PROJECT_FILETYPES, write_project, project_ops  # Project files
+from calendar_export import export_bytes  # Excel export of the calendar
+from calendar_templates import DEFAULT_TEMPLATE, load_template, template_ops  # Academic calendar templates
+from calendar_grid import MonthGridView  # Month grid view of the calendar
+from calendar_search import EventIndex  # Event search
+from calendar_rules import PolicyChecker  # Calendar policy checks
+from calendar_diagnostics import Diagnostics  # Widget count and memory diagnostics
 
 # Global variables to store event data and UI components
 date_label_dict = {}  # Dictionary to map dates to their corresponding labels
-added_events = []  # List to keep track of added events
+row_labels = {}  # Dictionary to map dates to the date and day labels of their row
+shown_range = None  # (start, end) of the rows currently in the calendar frame
+row_anchor = None  # Date shown on the first row of the calendar frame
+calendar_model = CalendarModel()  # Calendar data (range, semesters and events)
+event_index = EventIndex(calendar_model)  # Word index of the events, for searching
+policy_checker = PolicyChecker(calendar_model)  # Policy violations of the calendar, kept up to date with it
+search_cursor = None  # Date of the last search result shown, Next/Previous continue from it
+calendar_client = None  # Connection to a shared calendar service, when started with --connect
+service_changes = queue.Queue()  # Changes received from the calendar service, applied on the UI thread
 events_window = None  # Window for displaying all events
 events_textbox = None  # Textbox to show events in the events window
+month_window = None  # Window for the month grid view
+month_view = None  # Month grid canvas in the month window
+diagnostics = Diagnostics()  # Measures widgets and memory around the tracked operations once started
+diagnostics_window = None  # Window for the diagnostics report
+diagnostics_textbox = None  # Textbox showing the diagnostics report
 
+@diagnostics.track("show_events_window")
 def show_events_window():
     """Creates and displays a window summarizing the number of working days by weekdays."""
     global events_window, events_textbox
@@ -20,6 +41,7 @@ def show_events_window():
         events_window = CTkToplevel()
         events_window.title("Working Days Summary")
         events_window.geometry("400x400")
+        diagnostics.watch("events window", events_window)
 
         title_label = CTkLabel(events_window, text="Working Days Summary", font=("Arial", 18, "bold"))
         title_label.pack(pady=10)
@@ -44,6 +66,55 @@ def show_events_window():
         events_textbox.insert(END, summary_text)
         events_textbox.configure(state="disabled")
 
+def show_month_view():
+    """Creates and displays a window with the calendar drawn as month grids."""
+    global month_window, month_view
+    if month_window is None or not month_window.winfo_exists():
+        month_window = CTkToplevel()
+        month_window.title("Month View")
+        month_window.geometry("800x650")
+
+        month_view = MonthGridView(month_window, calendar_model, on_click=add_event_on_date)
+        scrollbar = CTkScrollbar(month_window, command=month_view.yview)
+        month_view.configure(yscrollcommand=scrollbar.set)
+        month_view.pack(side="left", fill="both", expand=True, padx=(10, 0), pady=10)
+        scrollbar.pack(side="right", fill="y", pady=10)
+        month_view.bind("<MouseWheel>", lambda e: month_view.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+    month_window.focus()
+
+def show_diagnostics_window():
+    """Starts the diagnostics and shows the live widget counts, memory growth and latest tracked operations."""
+    global diagnostics_window, diagnostics_textbox
+    if not diagnostics.enabled:
+        diagnostics.start()
+    if diagnostics_window is None or not diagnostics_window.winfo_exists():
+        diagnostics_window = CTkToplevel()
+        diagnostics_window.title("Diagnostics")
+        diagnostics_window.geometry("700x500")
+        diagnostics.ignore(diagnostics_window)  # Keep the report window out of the counts
+
+        button_frame = CTkFrame(diagnostics_window, fg_color='transparent')
+        button_frame.pack(fill='x', padx=10, pady=(10, 0))
+        CTkButton(button_frame, text='Refresh', corner_radius=4, width=80, command=show_diagnostics_window).pack(side='left')
+        CTkButton(button_frame, text='Reset Baseline', corner_radius=4, width=120,
+                  command=lambda: (diagnostics.reset_baseline(), show_diagnostics_window())).pack(side='left', padx=5)
+
+        diagnostics_textbox = CTkTextbox(diagnostics_window, font=("Consolas", 12), wrap="none")
+        diagnostics_textbox.pack(expand=True, fill='both', padx=10, pady=10)
+
+    diagnostics_textbox.configure(state="normal")
+    diagnostics_textbox.delete("1.0", END)
+    diagnostics_textbox.insert(END, diagnostics.report())
+    diagnostics_textbox.configure(state="disabled")
+    diagnostics_window.focus()
+
+def add_event_on_date(day):
+    """Asks for an event name and adds it to the clicked date of the month view."""
+    initial = option.get() if option.get() in options and option.get() != "Others" else ""
+    event_value = simpledialog.askstring("Add Event", f"Event on {day.strftime(DATE_FORMAT)}:", initialvalue=initial, parent=month_window)
+    if event_value:
+        submit_calendar_op({"op": "add_event", "dates": [day.isoformat()], "event": event_value})
+
 def update_working_days_display():
     """Updates the Working Days textbox with the summary of working days."""
     working_days_textbox.configure(state="normal")
@@ -69,17 +140,14 @@ def update_events_display():
         events_textbox.delete("1.0", END)  # Clear existing text
         
         events_by_date = {}  # Dictionary to group events by date
-        # Populate events_by_date with events from date_label_dict
-        for date_str, (_, label) in date_label_dict.items():
-            event_text = label.cget("text")  # Get the text of the event label
+        # Populate events_by_date with the schedule of every date in the calendar
+        for day in calendar_model.days():
+            event_text = calendar_model.schedule_text(day)  # Get the schedule text of the date
             if event_text:
-                if date_str not in events_by_date:
-                    events_by_date[date_str] = []  # Initialize list for new date
-                events_by_date[date_str].append(event_text)  # Append event text
-        
-        # Sort dates and display events
-        for date_str in sorted(events_by_date.keys(), key=lambda x: datetime.strptime(x, "%d/%m/%y")):
-            events = events_by_date[date_str]
+                events_by_date[day.strftime(DATE_FORMAT)] = [event_text]
+
+        # Display events in date order
+        for date_str, events in events_by_date.items():
             events_textbox.insert(END, f"\nDate: {date_str}\n")  # Insert date header
             events_textbox.insert(END, "─" * 30 + "\n")  # Insert separator
             for event in events:
@@ -87,86 +155,221 @@ def update_events_display():
         
         events_textbox.configure(state="disabled")  # Disable editing
 
+@diagnostics.track("update_frame")
 def update_frame():
-    """Updates the calendar frame based on the selected date range."""
-    global date_label_dict
+    """Sends the selected date range and semester dates to the calendar."""
     start_date = startDate.get_date()  # Get start date from DateEntry
     end_date = endDate.get_date()  # Get end date from DateEntry
-
-    # Clear existing widgets in the date frame
-    for widget in date_frame.winfo_children():
-        widget.destroy()
-
-    headers = ["Date", "Day", "Schedule"]  # Column headers for the calendar
-    # Create header labels
-    for col, header in enumerate(headers):
-        CTkLabel(date_frame, text=header, font=("Consolas", 15, "bold")).grid(row=0, column=col, padx=5, sticky='w')
-
-    # Separator line
-    CTkLabel(date_frame, text="-" * 50, font=("Consolas", 15)).grid(row=1, column=0, columnspan=3, sticky='ew', pady=5)
-
-    current_date = start_date  # Initialize current date
-    row = 2  # Start from the third row in the grid
-    date_label_dict = {}  # Reset date_label_dict for new date range
-
-    # Loop through each date in the selected range
-    while current_date <= end_date:
-        date_str = current_date.strftime('%d/%m/%y')  # Format date as string
+    if start_date > end_date:  # Check for valid date range
+        messagebox.showerror("Error", "Start date cannot be after end date.")
+        return
+
+    semesters = {name: [start.get_date().isoformat(), end.get_date().isoformat()] for name, (start, end) in semester_entries.items()}
+    if submit_calendar_op({"op": "set_range", "start": start_date.isoformat(), "end": end_date.isoformat()}):
+        submit_calendar_op({"op": "set_semesters", "semesters": semesters})
+
+def render_calendar(rebuild=False):
+    """Brings the calendar frame in line with the calendar range, creating or removing only the rows that changed."""
+    global shown_range, row_anchor
+
+    if rebuild or calendar_model.start is None:
+        # Clear existing widgets in the date frame
+        for widget in date_frame.winfo_children():
+            widget.destroy()
+        date_label_dict.clear()
+        row_labels.clear()
+        shown_range = None
+    if calendar_model.start is None:
+        return
+
+    new_start, new_end = calendar_model.start, calendar_model.end
+    one_day = timedelta(days=1)
+    if shown_range is None:
+        headers = ["Date", "Day", "Schedule"]  # Column headers for the calendar
+        # Create header labels
+        for col, header in enumerate(headers):
+            CTkLabel(date_frame, text=header, font=("Consolas", 15, "bold")).grid(row=0, column=col, padx=5, sticky='w')
+
+        # Separator line
+        CTkLabel(date_frame, text="-" * 50, font=("Consolas", 15)).grid(row=1, column=0, columnspan=3, sticky='ew', pady=5)
+
+        row_anchor = new_start
+        added_days = list(day_span(new_start, new_end))
+    else:
+        old_start, old_end = shown_range
+        # Remove the rows of dates that left the range
+        for current_date in list(day_span(old_start, min(old_end, new_start - one_day))) + list(day_span(max(old_start, new_end + one_day), old_end)):
+            date_str = current_date.strftime(DATE_FORMAT)
+            date_label_dict.pop(date_str)[1].destroy()
+            for widget in row_labels.pop(date_str):
+                widget.destroy()
+        added_days = list(day_span(new_start, min(new_end, old_start - one_day))) + list(day_span(max(new_start, old_end + one_day), new_end))
+
+        if new_start < row_anchor:
+            # Rows are placed relative to the first date, so move the kept rows down
+            row_anchor = new_start
+            for date_str, (_, schedule_label) in list(date_label_dict.items()):
+                row = (datetime.strptime(date_str, DATE_FORMAT).date() - row_anchor).days + 2
+                for widget in row_labels[date_str] + (schedule_label,):
+                    widget.grid_configure(row=row)
+                date_label_dict[date_str] = (row, schedule_label)
+
+    # Create rows for the new dates, starting from the third row in the grid
+    for current_date in added_days:
+        row = (current_date - row_anchor).days + 2
+        date_str = current_date.strftime(DATE_FORMAT)  # Format date as string
         day_str = current_date.strftime('%a')  # Get day of the week
 
         # Create labels for date, day, and schedule
         date_label = CTkLabel(date_frame, text=date_str, font=("Consolas", 15))
         day_label = CTkLabel(date_frame, text=day_str, font=("Consolas", 15))
-        schedule_label = CTkLabel(date_frame, text="", font=("Consolas", 15))
+        schedule_label = CTkLabel(date_frame, text=calendar_model.display_text(current_date), font=("Consolas", 15))
 
         # Place labels in the grid
         date_label.grid(row=row, column=0, padx=5, sticky='w')
         day_label.grid(row=row, column=1, padx=5, sticky='w')
         schedule_label.grid(row=row, column=2, padx=5, sticky='w')
 
-        # Determine schedule text based on the day of the week
-        if current_date.weekday() == 6:  # Sunday
-            schedule_label.configure(text="Sunday")
-        elif current_date.weekday() == 5:  # Saturday
-            saturday_number = (current_date.day - 1) // 7 + 1  # Calculate Saturday number
-            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(saturday_number % 10 * (saturday_number % 100 not in [11, 12, 13]), 'th')
-            schedule_text = f"{saturday_number}{suffix} Saturday"  # Format Saturday text
-            if saturday_number % 2 == 0:  # Even Saturday
-                schedule_text += " : Holiday"
-            schedule_label.configure(text=schedule_text)
-
-        # Store the label in the date_label_dict
+        # Store the labels of the row
         date_label_dict[date_str] = (row, schedule_label)
-        current_date += timedelta(days=1)  # Move to the next day
-        row += 1  # Move to the next row
-
-    # Call the function to display working days
-    display_working_days()
-    
+        row_labels[date_str] = (date_label, day_label)
+
+    shown_range = (new_start, new_end)
+
+def on_calendar_change(change):
+    """Refreshes the calendar view and summaries after the calendar data changed."""
+    if change["op"]["op"] in ("add_event", "remove_last_event"):
+        # Only the labels of the edited dates need new text
+        for day in map(parse_date, change["dates"]):
+            date_str = day.strftime(DATE_FORMAT)
+            if date_str in date_label_dict:
+                date_label_dict[date_str][1].configure(text=calendar_model.display_text(day))
+        update_selected_events_display()
+        update_working_days_display()
+    elif change["op"]["op"] != "set_semesters":
+        render_calendar(rebuild=change["op"]["op"] == "load")  # A loaded calendar may differ on every date
+        display_working_days()
+    update_events_display()  # Refresh the events display
+    update_policy_display()  # The checker already re-checked the affected dates
+    if month_window is not None and month_window.winfo_exists():
+        month_view.refresh(change)  # Redraws only the edited dates
+
+def submit_calendar_op(op):
+    """Applies an edit to the calendar, through the calendar service when connected. Returns True on success."""
+    try:
+        if calendar_client:
+            calendar_client.submit(op)  # Sent with the calendar version when it could overwrite someone else's change
+        else:
+            calendar_model.apply(op)
+    except VersionConflict as e:
+        try:
+            calendar_client.resync()  # Show what the others changed
+        except (OSError, ValueError):
+            pass  # Service unreachable, the listener resyncs once it is back
+        messagebox.showerror("Calendar Changed", f"{e}.\nThe calendar has been reloaded with their changes, please check it and try again.")
+        return False
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Error", str(e))
+        return False
+    return True
+
+def poll_service_changes():
+    """Applies changes received from the calendar service on the UI thread."""
+    while not service_changes.empty():
+        try:
+            calendar_client.receive(service_changes.get_nowait())
+        except (OSError, ValueError):
+            pass  # Service unreachable, the listener resyncs once it is back
+    app.after(100, poll_service_changes)
 
 def get_working_days_by_weekday():
     """Returns a dictionary of working days grouped by weekdays (Monday to Friday and Saturday) with counts."""
-    working_days_by_weekday = {day: {"dates": [], "count": 0} for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]}
-
-    # Iterate over date_label_dict to filter and categorize working days
-    for date_str, (_, schedule_label) in date_label_dict.items():
-        current_date = datetime.strptime(date_str, "%d/%m/%y")
-        day_name = current_date.strftime("%A")  # Full name of the day (e.g., Monday)
-
-        schedule_text = schedule_label.cget("text")
-        if day_name == "Saturday":
-            # Include Saturday only if it's not marked as a holiday
-            if "Holiday" not in schedule_text:
-                working_days_by_weekday[day_name]["dates"].append(date_str)
-                working_days_by_weekday[day_name]["count"] += 1
-        elif day_name not in ["Sunday"] and "Holiday" not in schedule_text:
-            # Include weekdays (Monday to Friday) if they are not marked as holidays
-            working_days_by_weekday[day_name]["dates"].append(date_str)
-            working_days_by_weekday[day_name]["count"] += 1
-
-    return working_days_by_weekday
-
-
+    return calendar_model.working_days_by_weekday()
+
+
+
+def count_working_days():
+    """Shows the number of working days between the query dates, for a semester and weekday if selected."""
+    semester = query_semester.get()
+    weekday = query_weekday.get()
+    try:
+        count = calendar_model.working_days_between(
+            query_start.get_date(), query_end.get_date(),
+            weekday=None if weekday == "All days" else weekday,
+            semester=None if semester == "All semesters" else semester,
+        )
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+        return
+    query_result.configure(text=f"{count} working days")
+
+def suggest_end_date():
+    """Sets the selected semester's end date to the first date meeting the working day targets, in the calendar too."""
+    semester = query_semester.get()
+    if semester == "All semesters":
+        messagebox.showerror("Error", "Please select a semester.")
+        return
+    try:
+        min_days = int(min_days_entry.get() or 0)
+        weekday_minimums = {}
+        # Per weekday targets are written as "Monday=12, Friday=10"
+        for target in filter(None, (part.strip() for part in weekday_targets_entry.get().split(","))):
+            day, _, minimum = target.partition("=")
+            weekday_minimums[day.strip()] = int(minimum)
+        sem_start, sem_end = semester_entries[semester]
+        dates = calendar_model.end_date_range(sem_start.get_date(), min_days, weekday_minimums)
+    except ValueError as e:
+        messagebox.showerror("Error", f"Invalid working day targets. {e}")
+        return
+
+    if dates is None:
+        query_result.configure(text="No end date in the calendar range meets the targets")
+        return
+    # Only this semester's end date changes; the others keep the dates last generated
+    semesters = {name: [start.isoformat(), end.isoformat()] for name, (start, end) in calendar_model.semesters.items()}
+    semesters[semester] = [sem_start.get_date().isoformat(), dates[0].isoformat()]
+    if not submit_calendar_op({"op": "set_semesters", "semesters": semesters}):
+        return
+    sem_end.set_date(dates[0])
+    query_result.configure(text=f"{semester} now ends on {dates[0].strftime(DATE_FORMAT)} (it can end from {dates[0].strftime(DATE_FORMAT)} to {dates[1].strftime(DATE_FORMAT)})")
+
+def show_search_results(text):
+    """Shows text in the search results textbox."""
+    search_textbox.configure(state="normal")
+    search_textbox.delete("1.0", END)
+    search_textbox.insert(END, text)
+    search_textbox.configure(state="disabled")
+
+def update_policy_display():
+    """Shows the current policy violations."""
+    lines = policy_checker.messages()
+    policy_title.configure(text=f"Policy Violations ({len(lines)})")
+    policy_textbox.configure(state="normal")
+    policy_textbox.delete("1.0", END)
+    policy_textbox.insert(END, "\n".join(lines) if lines else "No policy violations.")
+    policy_textbox.configure(state="disabled")
+
+def search_events():
+    """Lists every date with an event matching the search box."""
+    global search_cursor
+    search_cursor = None
+    matches = event_index.search(search_entry.get())
+    lines = [f"{day.strftime(DATE_FORMAT)}: {' | '.join(calendar_model.day_events(day))}" for day in matches]
+    show_search_results("\n".join(lines) if lines else "No matching events.")
+
+def find_occurrence(forward, holiday=False):
+    """Shows the next or previous date (from today, or from the last one shown) matching the search box, or the next holiday."""
+    global search_cursor
+    reference = search_cursor or datetime.now().date()
+    if forward:
+        day = event_index.next_occurrence(search_entry.get(), after=reference, holiday=holiday)
+    else:
+        day = event_index.previous_occurrence(search_entry.get(), before=reference, holiday=holiday)
+    if day is None:
+        show_search_results("No more matching dates." if not holiday else "No more holidays.")
+        return
+    search_cursor = day
+    show_search_results(f"{day.strftime(DATE_FORMAT)} ({day.strftime('%A')}): {calendar_model.schedule_text(day)}")
 
 def display_working_days():
     """Displays the working days grouped by weekdays with their counts, dynamically handling Saturdays."""
@@ -186,51 +389,7 @@ def display_working_days():
     global_textbox.configure(state="disabled")
 
 
-def add_event_to_calendar(row, event):
-    """Adds an event to the calendar on the specified row."""
-    date_str = list(date_label_dict.keys())[row - 2]  # Get the date string from the dictionary
-    schedule_label = date_label_dict[date_str][1]  # Get the corresponding schedule label
-    current_text = schedule_label.cget("text")  # Get current text of the schedule label
-
-    date = datetime.strptime(date_str, "%d/%m/%y")  # Convert date string to datetime object
-    is_weekend = date.weekday() in [5, 6]  # Check if the date is a weekend (Saturday or Sunday)
-    day_name = date.strftime("%A")  # Get the name of the day
-
-    # Check if the event is a holiday
-    is_holiday = "Holiday" in event
-
-    if is_holiday:
-        # If it's a holiday, set the schedule label as the holiday event
-        schedule_label.configure(text=event)
-    else:
-        # Allow multiple events by appending them
-        new_text = current_text + " | " + event if current_text else event
-
-        # Split text into lines if it exceeds 50 characters
-        if len(new_text) > 50:
-            new_text = '\n'.join(new_text[i:i + 50] for i in range(0, len(new_text), 50))
-
-        schedule_label.configure(text=new_text)  # Update the schedule label with the new text
-
-    # Handle Saturday-specific logic
-    if day_name == "Saturday":
-        if is_holiday:
-            # If a Saturday is marked as a holiday, update its label and remove it from working days
-            schedule_label.configure(text=f"{event}")
-        else:
-            # Add a custom label for Saturdays if no holiday
-            saturday_number = (date.day - 1) // 7 + 1  # Calculate which Saturday of the month
-            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(saturday_number, 'th')
-            new_label = f"{saturday_number}{suffix} Saturday"
-            schedule_label.configure(text=f"{new_label} | {event}" if event else new_label)
-
-    # Store the updated schedule label in the date_label_dict
-    date_label_dict[date_str] = (row, schedule_label)
-
-    # Update the working days display after the event is added
-    display_working_days()  # Refresh the working days display
-    update_events_display()  # Refresh the events display in the UI
-
+@diagnostics.track("selection")
 def selection(value):
     """Handles the selection of an event type and updates the UI accordingly."""
     for widget in frame4.winfo_children():
@@ -274,25 +433,15 @@ def selection(value):
 
         # Add event to the calendar for a single day
         if day_type.get() == "Single Day":
-            formatted_date = date_value.get_date().strftime("%d/%m/%y")
-            if formatted_date in date_label_dict:
-                row = list(date_label_dict.keys()).index(formatted_date) + 2  # Get row index
-                add_event_to_calendar(row, event_value)  # Add event
-            else:
-                messagebox.showerror("Error", "Invalid date selected")
+            dates = [date_value.get_date()]
         else:  # Handle multiple days
             start_date = start_date_value.get_date()
             end_date = end_date_value.get_date()
             if start_date > end_date:  # Check for valid date range
                 messagebox.showerror("Error", "Start date cannot be after end date.")
                 return
-            current_date = start_date
-            while current_date <= end_date:  # Loop through each date in the range
-                formatted_date = current_date.strftime("%d/%m/%y")
-                if formatted_date in date_label_dict:
-                    row = list(date_label_dict.keys()).index(formatted_date) + 2  # Get row index
-                    add_event_to_calendar(row, event_value)  # Add event
-                current_date += timedelta(days=1)  # Move to the next day
+            dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        submit_calendar_op({"op": "add_event", "dates": [day.isoformat() for day in dates], "event": event_value})
 
     # Display selected option and checkbox in the frame
     CTkLabel(frame4, text=f'Option selected: {value}').grid(row=0, column=0, sticky='nw', columnspan=2)
@@ -345,406 +494,106 @@ def selection(value):
 
     update_date_fields()  # Initialize date fields based on selection
 
+def apply_academic_template(template=DEFAULT_TEMPLATE):
+    """Adds the events of the academic template to every semester of the generated calendar."""
+    if calendar_model.start is None:
+        messagebox.showerror("Error", "Please generate the calendar first.")
+        return
+    ops, skipped = template_ops(calendar_model, template)
+    for op in ops:
+        if not submit_calendar_op(op):
+            return
+    message = f"Added {len(ops)} template events."
+    if skipped:
+        message += f"\n{len(skipped)} events fall outside the calendar range and were skipped."
+    messagebox.showinfo("Info", message)
+
+def apply_template_file():
+    """Adds the events of a template saved as a JSON file to every semester of the generated calendar."""
+    if calendar_model.start is None:
+        messagebox.showerror("Error", "Please generate the calendar first.")
+        return
+    file_path = filedialog.askopenfilename(filetypes=[("Template files", "*.json")])
+    if not file_path:
+        return
+    try:
+        template = load_template(file_path)
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Error", f"Failed to load template. Error: {e}")
+        return
+    apply_academic_template(template)
+
+def save_project():
+    """Saves the calendar to a project file that can be opened again or merged with other departments."""
+    if calendar_model.start is None:
+        messagebox.showerror("Error", "Please generate the calendar first.")
+        return
+    file_path = filedialog.asksaveasfilename(defaultextension=".calproj", filetypes=PROJECT_FILETYPES)
+    if file_path:
+        try:
+            write_project(calendar_model, file_path)
+            messagebox.showinfo("Success", "Project saved successfully.")
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save project. Error: {e}")
+
+def open_project():
+    """Replaces the calendar with a saved project file."""
+    file_path = filedialog.askopenfilename(filetypes=PROJECT_FILETYPES)
+    if not file_path:
+        return
+    try:
+        ops = project_ops(file_path)
+    except (OSError, ValueError, KeyError) as e:
+        messagebox.showerror("Error", f"Failed to open project. Error: {e}")
+        return
+    if not ops:
+        messagebox.showerror("Error", "The project has no calendar range.")
+        return
+
+    # Show the project's range and semester dates in the date fields
+    startDate.set_date(parse_date(ops[0]["start"]))
+    endDate.set_date(parse_date(ops[0]["end"]))
+    for name, (start, end) in ops[1]["semesters"].items():
+        if name in semester_entries:
+            semester_entries[name][0].set_date(parse_date(start))
+            semester_entries[name][1].set_date(parse_date(end))
+
+    if submit_calendar_op({"op": "clear"}):
+        for op in ops:
+            if not submit_calendar_op(op):
+                break
+
 def clear_last_event():
     """Clears the last added event from the calendar and updates the display."""
-    if added_events:
-        row, label = added_events.pop()  # Remove the last event
-        label.configure(text="")  # Clear the label text
-        global_textbox.configure(state="normal")
-        lines = global_textbox.get("1.0", END).split('\n')  # Get all lines from the textbox
-        global_textbox.delete("1.0", END)  # Clear the textbox
-        for line in lines[:-2]:  # Reinsert all lines except the last two (the last event)
-            global_textbox.insert(END, line + '\n')
-        global_textbox.configure(state="disabled")  # Disable editing
-        update_events_display()  # Refresh the events display
+    if calendar_model.last_addition(calendar_client.author if calendar_client else None) is not None:
+        submit_calendar_op({"op": "remove_last_event"})  # Remove the last event added from this window
     else:
         messagebox.showinfo("Info", "No events to clear.")  # Inform if no events are present
 
 def clear_calendar():
     """Clears the entire calendar and resets all data."""
-    global date_label_dict, added_events
     startDate.set_date(datetime.now())  # Reset start date to today
     endDate.set_date(datetime.now())  # Reset end date to today
-    added_events = []  # Clear added events
-    for widget in date_frame.winfo_children():
-        widget.destroy()  # Remove all widgets from the date frame
-    date_label_dict = {}  # Reset date_label_dict
-    global_textbox.configure(state="normal")
-    global_textbox.delete("1.0", END)  # Clear the global textbox
-    global_textbox.configure(state="disabled")
-    update_events_display()  # Refresh the events display
-    messagebox.showinfo("Info", "Calendar cleared successfully.")  # Inform user of success
+    if submit_calendar_op({"op": "clear"}):
+        messagebox.showinfo("Info", "Calendar cleared successfully.")  # Inform user of success
+
 def update_selected_events_display():
     """Updates the Selected Events textbox with the latest events."""
     global_textbox.configure(state="normal")
     global_textbox.delete("1.0", END)
 
-    for date_str, (_, label) in date_label_dict.items():
-        event_text = label.cget("text")
+    for day in calendar_model.days():
+        event_text = calendar_model.schedule_text(day)
         if event_text:
-            global_textbox.insert(END, f"{date_str}: {event_text}\n")
+            global_textbox.insert(END, f"{day.strftime(DATE_FORMAT)}: {event_text}\n")
 
     global_textbox.configure(state="disabled")
 
-def add_event_to_calendar(row, event):
-    """Adds an event to the calendar and updates the displays."""
-    date_str = list(date_label_dict.keys())[row - 2]  # Get the date string
-    schedule_label = date_label_dict[date_str][1]  # Get the corresponding schedule label
-    current_text = schedule_label.cget("text")
-
-    # Update the schedule label
-    new_text = current_text + " | " + event if current_text else event
-    schedule_label.configure(text=new_text)
-
-    # Refresh the displays
-    update_selected_events_display()
-    update_working_days_display()
-    
 def convert_to_excel():
     """Converts the current calendar to an Excel file."""
-    wb = openpyxl.Workbook()
-    sheet = wb.active
-    sheet.title = "Calendar"
-
-    # Initialize row at the start
-    row = 4  # Start from row 4 (after headers)
-
-    # Define cell styles
-    header_fill = PatternFill(start_color="4F6228", end_color="4F6228", fill_type="solid")  # Header fill color
-    subheader_fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")  # Subheader fill color
-    holiday_fill = PatternFill(start_color="ED7D31", end_color="ED7D31", fill_type="solid")  # Holiday fill color
-    light_blue_fill = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")  # Light blue fill for academic events
-    light_violet_fill = PatternFill(start_color="E4D7F1", end_color="E4D7F1", fill_type="solid")  # Light violet fill for cultural events
-    border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))  # Cell border style
-
-
-    
-    # Define events that should be colored light blue (academic events)
-    light_blue_events = [
-        'Enrolment and commencement of classes for all UG and PG / commencement',
-        'Finalisation of electives',
-        'First Class committee meeting',
-        'Commencement of Mid-Semester Exam',
-        'Completion of quizzes, midsem and attendance entry in AUMS',
-        'Second class committee',
-        'Missed mid semester exam',
-        'Pre-registration for next sem, course end survey, faculty feedback',
-        'Finalisation of internals and attendance',
-        'Last instruction day',
-        'Commencement of end-semester exams'
-    ]
-
-    # Define events that should be colored light violet (festivals/cultural events)
-    light_violet_events = [
-        'Sree Krishna Janmashtami',
-        'Ganesh Chaturthi',
-        'Deepavali'
-    ]
-
-    # Define holiday events
-    holiday_events = [
-        'Sree Krishna Janmashtami',
-        'Ganesh Chaturthi',
-        'Deepavali'
-    ]
-
-    # Get semester dates
-    sem_dates = {
-        'UG-S1': (datetime.combine(sem1_start.get_date(), datetime.min.time()),
-                  datetime.combine(sem1_end.get_date(), datetime.min.time())),
-        'UG-S3': (datetime.combine(sem3_start.get_date(), datetime.min.time()),
-                  datetime.combine(sem3_end.get_date(), datetime.min.time())),
-        'UG-S5': (datetime.combine(sem5_start.get_date(), datetime.min.time()),
-                  datetime.combine(sem5_end.get_date(), datetime.min.time())),
-        'UG-S7': (datetime.combine(sem7_start.get_date(), datetime.min.time()),
-                  datetime.combine(sem7_end.get_date(), datetime.min.time())),
-        'PG-S1': (datetime.combine(pg_sem1_start.get_date(), datetime.min.time()),
-                  datetime.combine(pg_sem1_end.get_date(), datetime.min.time())),
-        'PG-S3': (datetime.combine(pg_sem3_start.get_date(), datetime.min.time()),
-                  datetime.combine(pg_sem3_end.get_date(), datetime.min.time()))
-    }
-
-    # Group semesters by start date
-    semesters_by_start_date = {}
-    for sem_name, (start_date, end_date) in sem_dates.items():
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        if start_date_str not in semesters_by_start_date:
-            semesters_by_start_date[start_date_str] = {
-                'semesters': [],
-                'start_date': start_date,
-                'end_date': end_date
-            }
-        semesters_by_start_date[start_date_str]['semesters'].append(sem_name)
-        if end_date > semesters_by_start_date[start_date_str]['end_date']:
-            semesters_by_start_date[start_date_str]['end_date'] = end_date
-
-    # Initialize working day counters for each semester
-    working_days = {
-        'UG-S1': {'count': 0, 'start_date': None},
-        'UG-S3': {'count': 0, 'start_date': None},
-        'UG-S5': {'count': 0, 'start_date': None},
-        'UG-S7': {'count': 0, 'start_date': None},
-        'PG-S1': {'count': 0, 'start_date': None},
-        'PG-S3': {'count': 0, 'start_date': None}
-    }
-
-    headers = ["Date", "Day", "UG-S1", "UG-S3", "UG-S5", "UG-S7", "PG-S1", "PG-S3", "Events/Holidays"]
-
-    # Create merged headers
-    merged_headers = ["Date", "Day"]
-    merged_column_mapping = {}
-    current_col = 3
-
-    for start_date_str, group_info in sorted(semesters_by_start_date.items()):
-        sems = group_info['semesters']
-        if len(sems) > 1:
-            header = " & ".join(sems)
-            merged_headers.append(header)
-            for sem in sems:
-                merged_column_mapping[headers.index(sem) + 1] = current_col
-        else:
-            merged_headers.append(sems[0])
-            merged_column_mapping[headers.index(sems[0]) + 1] = current_col
-        current_col += 1
-
-    merged_headers.append("Events/Holidays")
-
-    total_columns = len(merged_headers)
-
-    # Write merged headers
-    for col, header in enumerate(merged_headers, start=1):
-        cell = sheet.cell(row=3, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = header_fill
-        cell.border = border
-        cell.alignment = Alignment(wrap_text=True, horizontal='center', vertical='center')
-
-    # Merge cells for the title and subtitle based on the number of semesters
-    for r in range(1, 3):
-        sheet.merge_cells(start_row=r, start_column=1, end_row=r, end_column=total_columns)  # Merge cells for title and subtitle
-        cell = sheet.cell(row=r, column=1)  # Get the first column of the merged cells
-        cell.font = Font(bold=True, size=14 if r == 1 else 12)
-        cell.alignment = Alignment(horizontal='center')
-
-    # Set title and subtitle
-    sheet['A1'] = 'Amrita School of Engineering Bengaluru'
-    sheet['A2'] = 'ACADEMIC CALENDAR (2024 - 2025) ODD SEMESTER'
-    title_cell = sheet['A1']
-    title_cell.font = Font(bold=True, size=14)
-    title_cell.alignment = Alignment(horizontal='center')
-
-    subtitle_cell = sheet['A2']
-    subtitle_cell.font = Font(bold=True, size=12)
-    subtitle_cell.alignment = Alignment(horizontal='center')
-
-    for i, width in enumerate([15] * (total_columns - 1) + [40], start=1):  # Last column (Events/Holidays) wider
-        sheet.column_dimensions[get_column_letter(i)].width = width
-
-    # Initialize variables for event column properties
-    event_column_index = total_columns  # Last column for events
-    event_column_width = 40  # Width for the event column
-    sheet.column_dimensions[get_column_letter(event_column_index)].width = event_column_width
-
-    # Initialize tracking variables
-    current_month = ""
-    saturday_count_per_month = 0
-    current_event = None
-    event_start_row = None
-    events_col = total_columns  # Last column for events
-
-    # Process each date
-    dates_list = sorted(date_label_dict.items(), key=lambda x: datetime.strptime(x[0], "%d/%m/%y"))
-    
-    for date_str, (_, schedule_label) in dates_list:
-        date = datetime.strptime(date_str, "%d/%m/%y")
-        event_text = schedule_label.cget("text")
-
-        # Handle month headers
-        if current_month != date.strftime("%B - %Y"):
-            current_month = date.strftime("%B - %Y")
-            # Create a new row for the month header
-            row += 1
-            # Merge cells across all columns for the month header
-            sheet.merge_cells(start_row=row, start_column=1, end_row=row, end_column=total_columns)
-            month_cell = sheet.cell(row=row, column=1, value=current_month)
-            month_cell.font = Font(bold=True)
-            month_cell.fill = PatternFill(start_color="ED7D31", end_color="ED7D31", fill_type="solid")  # Orange color
-            month_cell.alignment = Alignment(horizontal='center', vertical='center')
-            month_cell.border = border  # Add border to the merged cell
-            
-            # Add borders to all cells in the merged range
-            for col in range(1, total_columns + 1):
-                cell = sheet.cell(row=row, column=col)
-                cell.border = border
-            
-            row += 1
-            saturday_count_per_month = 0
-
-        # Write date and day
-        date_cell = sheet.cell(row=row, column=1, value=date.strftime("%d-%b"))
-        day_cell = sheet.cell(row=row, column=2, value=date.strftime("%a"))
-
-        # Apply borders and alignment
-        for col in range(1, total_columns + 1):
-            cell = sheet.cell(row=row, column=col)
-            cell.border = border
-            cell.alignment = Alignment(horizontal='center')
-
-        # Handle working days logic
-        is_working_day = True
-
-        # Handle Saturdays
-        if date.weekday() == 5:  # Saturday
-            saturday_count_per_month += 1
-            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(saturday_count_per_month, 'th')
-
-            if saturday_count_per_month in [2, 4]:
-                if event_text and not event_text.endswith("Saturday : Holiday"):
-                    is_working_day = True
-                    sheet.cell(row=row, column=events_col, value=event_text)
-                else:
-                    for col in range(1, total_columns + 1):
-                        sheet.cell(row=row, column=col).fill = holiday_fill
-                    is_working_day = False
-                    sheet.cell(row=row, column=events_col, 
-                             value=f"{saturday_count_per_month}{suffix} Saturday : Holiday")
-            else:
-                is_working_day = True
-                if event_text and not event_text.endswith("Saturday"):
-                    sheet.cell(row=row, column=events_col, value=event_text)
-                else:
-                    sheet.cell(row=row, column=events_col, 
-                             value=f"{saturday_count_per_month}{suffix} Saturday")
-
-                if event_text and any(holiday in event_text for holiday in holiday_events):
-                    for col in range(1, total_columns + 1):
-                        sheet.cell(row=row, column=col).fill = holiday_fill
-                    is_working_day = False
-
-        elif date.weekday() == 6:  # Sunday
-            for col in range(1, total_columns + 1):
-                sheet.cell(row=row, column=col).fill = holiday_fill
-            is_working_day = False
-            sheet.cell(row=row, column=events_col, value="Sunday")
-
-        # Handle working day counts
-        if is_working_day:
-            for start_date_str, group_info in semesters_by_start_date.items():
-                sems = group_info['semesters']
-                start_date = group_info['start_date']
-                end_date = group_info['end_date']
-                
-                if start_date <= date <= end_date:
-                    merged_col = None
-                    for sem in sems:
-                        orig_col = headers.index(sem) + 1
-                        merged_col = merged_column_mapping[orig_col]
-                        working_days[sem]['count'] += 1
-                        if working_days[sem]['start_date'] is None:
-                            working_days[sem]['start_date'] = date
-            
-                    if merged_col is not None:
-                        counts = [str(working_days[sem]['count']) for sem in sems]
-                        if all(counts[0] == count for count in counts):
-                            sheet.cell(row=row, column=merged_col, value=counts[0])
-                        else:
-                            sheet.cell(row=row, column=merged_col, value="/".join(counts))
-
-        # Handle events and merging
-        if event_text:
-            event_cell = sheet.cell(row=row, column=events_col, value=event_text)
-            event_cell.alignment = Alignment(horizontal='left', wrap_text=True)
-
-            # Check if this is a continuation of the current event
-            if event_text == current_event:
-                # Don't set the value again, just track the row
-                sheet.cell(row=row, column=events_col, value="")
-
-                # Keep the event text even on weekends
-                if date.weekday() in [5, 6]:  # Saturday or Sunday
-                    sheet.cell(row=row, column=events_col, value="")
-                
-            else:
-                # If there was a previous event, merge its cells
-                if current_event is not None and event_start_row is not None:
-                    sheet.merge_cells(start_row=event_start_row, start_column=events_col, 
-                                    end_row=row-1, end_column=events_col)
-                # Start tracking new event
-                current_event = event_text
-                event_start_row = row
-
-            # Apply appropriate fills based on event type
-            if any(event in event_text for event in light_blue_events):
-                for col in range(1, total_columns + 1):
-                    sheet.cell(row=row, column=col).fill = light_blue_fill
-            elif any(event in event_text for event in light_violet_events):
-                for col in range(1, total_columns + 1):
-                    sheet.cell(row=row, column=col).fill = light_violet_fill
-            elif any(event in event_text for event in holiday_events):
-                for col in range(1, total_columns + 1):
-                    sheet.cell(row=row, column=col).fill = holiday_fill
-        else:
-            # If there was an event and it's ending, merge its cells
-            if current_event is not None and event_start_row is not None:
-                sheet.merge_cells(start_row=event_start_row, start_column=events_col, 
-                                end_row=row-1, end_column=events_col)
-                current_event = None
-                event_start_row = None
-
-        row += 1
-
-    # Merge cells for any final event that reaches the end
-    if current_event is not None and event_start_row is not None:
-        sheet.merge_cells(start_row=event_start_row, start_column=events_col, 
-                         end_row=row-1, end_column=events_col)
-
-
-# Add Working Days Breakdown by Weekday
-    row += 2  # Leave some space after the last data row
-    breakdown_title = sheet.cell(row=row, column=1, value="Working Days Breakdown by Weekday")
-    breakdown_title.font = Font(bold=True, size=12)
-    breakdown_title.alignment = Alignment(horizontal='center')
-    sheet.merge_cells(start_row=row, start_column=1, end_row=row, end_column=total_columns)
-    for col in range(1, total_columns + 1):
-        cell = sheet.cell(row=row, column=col)
-        cell.border = border  # Add border to the title cell
-        cell.fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-    row += 1
-
-    # Retrieve working days by weekday
-    working_days_by_weekday = get_working_days_by_weekday()
-
-    for day, data in working_days_by_weekday.items():
-        # Display the weekday and its count
-        weekday_cell = sheet.cell(row=row, column=1, value=f"{day}: {data['count']} days")
-        weekday_cell.font = Font(bold=True)
-        weekday_cell.alignment = Alignment(horizontal='left')
-        weekday_cell.border = border
-
-        # List dates for each weekday
-        dates_cell = sheet.cell(row=row, column=2, value=", ".join(data["dates"]))
-        dates_cell.alignment = Alignment(horizontal='left', wrap_text=True)
-        dates_cell.border = border
-        row += 1
-
-    # Add Total Working Days Below Each Column
-    total_working_days_row = row + 2  # Leave some space after the last data row
-
-    # Title for Total Working Days
-    title_cell = sheet.cell(row=total_working_days_row, column=1, value="Total Working Days")
-    title_cell.font = Font(bold=True)
-    title_cell.alignment = Alignment(horizontal="center")
-    sheet.merge_cells(start_row=total_working_days_row, start_column=1, end_row=total_working_days_row, end_column=2)
-
-    for sem_name, data in working_days.items():
-        # Place total working days below the respective semester column
-        column_index = headers.index(sem_name) + 1  # Find the correct column
-        total_cell = sheet.cell(row=total_working_days_row, column=column_index, value=data["count"])
-        total_cell.font = Font(bold=True)
-        total_cell.alignment = Alignment(horizontal="center")
-        total_cell.border = border
-
-
+    if calendar_model.start is None:
+        messagebox.showerror("Error", "Please generate the calendar first.")
+        return
 
     # Save the Excel file
     file_path = filedialog.asksaveasfilename(
@@ -753,7 +602,8 @@ def convert_to_excel():
     )
     if file_path:
         try:
-            wb.save(file_path)
+            with open(file_path, "wb") as excel_file:
+                excel_file.write(export_bytes(calendar_model))  # Reuses the last export when nothing changed
             messagebox.showinfo("Success", "Data successfully exported to Excel.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save Excel file. Error: {e}")
@@ -808,6 +658,54 @@ global_textbox_title.pack(pady=(5, 0))
 global_textbox_frame.grid(row=2, column=0, sticky='nsew', padx=5, pady=4)
 frame.grid_rowconfigure(2, weight=3)  # Increased weight for more space
 
+# Event search
+search_frame = CTkFrame(frame)
+search_frame.grid(row=4, column=0, sticky='new', padx=5, pady=4)
+CTkLabel(search_frame, text="Find Events", font=("Arial", 16, "bold")).grid(row=0, column=0, columnspan=4, sticky='w', padx=10, pady=(5, 0))
+search_entry = CTkEntry(search_frame, width=300, placeholder_text="e.g. missed mid semester")
+search_entry.grid(row=1, column=0, columnspan=4, sticky='w', padx=10, pady=2)
+search_entry.bind("<Return>", lambda e: search_events())
+CTkButton(search_frame, text='Search', corner_radius=4, width=80, command=search_events).grid(row=2, column=0, sticky='w', padx=10, pady=5)
+CTkButton(search_frame, text='Previous', corner_radius=4, width=80, command=lambda: find_occurrence(False)).grid(row=2, column=1, sticky='w', pady=5)
+CTkButton(search_frame, text='Next', corner_radius=4, width=80, command=lambda: find_occurrence(True)).grid(row=2, column=2, sticky='w', padx=5, pady=5)
+CTkButton(search_frame, text='Next Holiday', corner_radius=4, width=100, command=lambda: find_occurrence(True, holiday=True)).grid(row=2, column=3, sticky='w', pady=5)
+search_textbox = CTkTextbox(search_frame, height=100, state="disabled")
+search_textbox.grid(row=3, column=0, columnspan=4, sticky='we', padx=10, pady=(0, 10))
+search_frame.grid_columnconfigure(3, weight=1)
+
+# Policy violations, re-checked as the calendar changes
+policy_frame = CTkFrame(frame)
+policy_frame.grid(row=5, column=0, sticky='new', padx=5, pady=4)
+policy_title = CTkLabel(policy_frame, text="Policy Violations", font=("Arial", 16, "bold"))
+policy_title.pack(anchor='w', padx=10, pady=(5, 0))
+policy_textbox = CTkTextbox(policy_frame, height=100, state="disabled")
+policy_textbox.pack(fill='x', padx=10, pady=(0, 10))
+
+# Working days query: count working days between two dates
+query_frame = CTkFrame(frame)
+query_frame.grid(row=3, column=0, sticky='new', padx=5, pady=4)
+CTkLabel(query_frame, text="Count Working Days", font=("Arial", 16, "bold")).grid(row=0, column=0, columnspan=4, sticky='w', padx=10, pady=(5, 0))
+CTkLabel(query_frame, text="From:").grid(row=1, column=0, sticky='w', padx=10, pady=2)
+query_start = DateEntry(query_frame, date_pattern="dd/mm/yyyy")
+query_start.grid(row=1, column=1, sticky='w')
+CTkLabel(query_frame, text="To:").grid(row=1, column=2, sticky='w', padx=10, pady=2)
+query_end = DateEntry(query_frame, date_pattern="dd/mm/yyyy")
+query_end.grid(row=1, column=3, sticky='w')
+query_semester = CTkOptionMenu(query_frame, values=["All semesters"] + SEMESTERS, corner_radius=1)
+query_semester.grid(row=2, column=0, columnspan=2, sticky='w', padx=10, pady=5)
+query_weekday = CTkOptionMenu(query_frame, values=["All days"] + WEEKDAYS, corner_radius=1)
+query_weekday.grid(row=2, column=2, columnspan=2, sticky='w', pady=5)
+CTkLabel(query_frame, text="Minimum days:").grid(row=3, column=0, sticky='w', padx=10, pady=2)
+min_days_entry = CTkEntry(query_frame, width=80, placeholder_text="90")
+min_days_entry.grid(row=3, column=1, sticky='w')
+CTkLabel(query_frame, text="Per weekday:").grid(row=3, column=2, sticky='w', padx=10, pady=2)
+weekday_targets_entry = CTkEntry(query_frame, width=160, placeholder_text="Monday=12, Friday=10")
+weekday_targets_entry.grid(row=3, column=3, sticky='w')
+CTkButton(query_frame, text='Count', corner_radius=4, width=80, command=count_working_days).grid(row=4, column=0, sticky='w', padx=10, pady=(5, 10))
+CTkButton(query_frame, text='Suggest End Date', corner_radius=4, width=140, command=suggest_end_date).grid(row=4, column=1, columnspan=2, sticky='w', pady=(5, 10))
+query_result = CTkLabel(query_frame, text="")
+query_result.grid(row=5, column=0, columnspan=4, sticky='w', padx=10, pady=(0, 10))
+
 
 # Working Days Title and Textbox
 
@@ -928,9 +826,27 @@ pg_sem3_end_label.grid(row=9, column=2, sticky='w', padx=5)
 pg_sem3_end = DateEntry(frame2, date_pattern="dd/mm/yyyy")
 pg_sem3_end.grid(row=9, column=3, sticky='w')
 
+# Semester date fields by semester name
+semester_entries = {
+    'UG-S1': (sem1_start, sem1_end),
+    'UG-S3': (sem3_start, sem3_end),
+    'UG-S5': (sem5_start, sem5_end),
+    'UG-S7': (sem7_start, sem7_end),
+    'PG-S1': (pg_sem1_start, pg_sem1_end),
+    'PG-S3': (pg_sem3_start, pg_sem3_end)
+}
+
 # Generate Calendar button (moved to bottom)
 btn = CTkButton(frame2, text='Generate Calendar', corner_radius=4, height=30, width=320, command=update_frame)
 btn.grid(row=10, column=0, columnspan=4, sticky='w', padx=10, pady=10)
+template_btn = CTkButton(frame2, text='Apply Academic Template', corner_radius=4, height=30, width=200, command=apply_academic_template)
+template_btn.grid(row=11, column=0, columnspan=4, sticky='w', padx=10, pady=(0, 10))
+template_file_btn = CTkButton(frame2, text='Apply Template File', corner_radius=4, height=30, width=200, command=apply_template_file)
+template_file_btn.grid(row=12, column=0, columnspan=4, sticky='w', padx=10, pady=(0, 10))
+open_btn = CTkButton(frame2, text='Open Project', corner_radius=4, height=30, width=150, command=open_project)
+open_btn.grid(row=13, column=0, columnspan=2, sticky='w', padx=10, pady=(0, 10))
+save_btn = CTkButton(frame2, text='Save Project', corner_radius=4, height=30, width=150, command=save_project)
+save_btn.grid(row=13, column=2, columnspan=2, sticky='w', padx=10, pady=(0, 10))
 
 
 # Buttons for clearing last event and clearing the calendar
@@ -940,6 +856,38 @@ clear_cal = CTkButton(frame1, height=38, text='Clear Calendar', corner_radius=5,
 clear_cal.grid(row=0, column=1, padx=8, pady=(0,10))
 excel = CTkButton(frame1, height=38, text='Convert to Excel', corner_radius=5, command=convert_to_excel)
 excel.grid(row=0, column=2, pady=(0,10))
+month_btn = CTkButton(frame1, height=38, text='Month View', corner_radius=5, command=show_month_view)
+month_btn.grid(row=0, column=4, padx=(0, 8), pady=(0,10))
+diagnostics_btn = CTkButton(frame1, height=38, text='Diagnostics', corner_radius=5, command=show_diagnostics_window)
+diagnostics_btn.grid(row=0, column=5, padx=(0, 8), pady=(0,10))
+
+# Containers whose widget counts the diagnostics report
+diagnostics.root = app
+diagnostics.watch("calendar rows", date_frame)
+diagnostics.watch("event form", frame4)
+diagnostics.watch("left panel", frame)
+
+# Log the widget and memory growth of every tracked operation: python calender.py --diagnostics
+if "--diagnostics" in sys.argv:
+    diagnostics.log = print
+    diagnostics.start()
+
+# Keep the calendar view in sync with the calendar data
+calendar_model.subscribe(on_calendar_change)
+
+# Join a shared calendar service when started with: python calender.py --connect http://127.0.0.1:8765
+if "--connect" in sys.argv:
+    from calendar_service import CalendarClient
+    try:
+        service_url = sys.argv[sys.argv.index("--connect") + 1]
+        calendar_client = CalendarClient(service_url, calendar_model)
+        calendar_client.listen(service_changes.put)
+    except (IndexError, OSError, ValueError) as e:
+        calendar_client = None
+        messagebox.showerror("Error", f"Could not connect to the calendar service, working locally instead. Error: {e}")
+    else:
+        app.title(f"Calendar Generator - {service_url}")
+        poll_service_changes()
 
 # Start the main application loop
 app.mainloop()
\ No newline at end of file
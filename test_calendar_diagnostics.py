@@ -0,0 +1,128 @@
+# Tests for the widget count and memory diagnostics
+import tkinter
+import unittest
+
+from calendar_diagnostics import Diagnostics, count_widgets, format_delta
+
+
+class FakeEvent:
+    def __init__(self, widget):
+        self.widget = widget
+
+
+class FakeWidget:
+    """Stands in for a Tk widget: children, destroy() and <Destroy> bindings.
+
+    As in Tk, the bindings of a toplevel window also fire for the events of its descendants.
+    """
+
+    def __init__(self, parent=None, tk=None, toplevel=False):
+        self.parent = parent
+        self.children = []
+        self.destroyed = False
+        self.bindings = []
+        self.tk = tk or parent.tk
+        self.toplevel = self if toplevel or parent is None else parent.toplevel
+        if parent is not None:
+            parent.children.append(self)
+
+    def winfo_children(self):
+        if self.destroyed:
+            raise tkinter.TclError("bad window path name")
+        return list(self.children)
+
+    def bind(self, sequence, callback, add=None):
+        self.bindings.append(callback)
+
+    def destroy(self):
+        for child in list(self.children):
+            child.destroy()
+        self.destroyed = True
+        if self.parent is not None:
+            self.parent.children.remove(self)
+        event = FakeEvent(self)
+        for callback in self.bindings + (self.toplevel.bindings if self.toplevel is not self else []):
+            callback(event)
+
+
+class DiagnosticsTest(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = tkinter.Tcl()  # Real Tcl commands, no display needed
+        self.root = FakeWidget(tk=self.interpreter.tk)
+        self.form = FakeWidget(self.root)
+        FakeWidget(self.form)
+        self.log = []
+        self.diagnostics = Diagnostics(self.root, log=self.log.append)
+        self.diagnostics.watch("form", self.form)
+        self.leaked = []
+
+        @self.diagnostics.track("rebuild form")
+        def rebuild_form(leak):
+            for widget in self.form.winfo_children():
+                widget.destroy()
+            FakeWidget(self.form)
+            if leak:
+                FakeWidget(self.root)  # A popup left behind on every call
+                self.leaked.append(bytearray(200000))
+                self.interpreter.createcommand(f"callback{len(self.leaked)}", print)
+            return "done"
+
+        self.rebuild_form = rebuild_form
+        self.addCleanup(lambda: self.diagnostics.enabled and self.diagnostics.stop())
+
+    def test_count_widgets(self):
+        self.assertEqual(count_widgets(self.root), 3)
+        self.assertEqual(count_widgets(self.root, {self.form}), 1)
+        self.form.destroy()
+        self.assertEqual(count_widgets(self.form), 0)
+
+    def test_calls_are_not_measured_until_started(self):
+        self.assertEqual(self.rebuild_form(True), "done")
+        self.assertEqual((self.log, list(self.diagnostics.history)), ([], []))
+
+    def test_churn_without_growth(self):
+        self.diagnostics.start()
+        for _ in range(3):
+            self.rebuild_form(False)
+        self.assertEqual(len(self.diagnostics.history), 3)
+        for label, delta in self.diagnostics.history:
+            self.assertEqual(label, "rebuild form")
+            self.assertEqual(delta["widgets"], {"all widgets": 0, "form": 0})
+            self.assertEqual(delta["tcl_commands"], 0)
+        self.assertEqual(len(self.log), 3)
+
+    def test_leaks_show_up_as_growth(self):
+        self.diagnostics.start()
+        self.rebuild_form(True)
+        self.rebuild_form(True)
+        _, delta = self.diagnostics.history[-1]
+        self.assertEqual(delta["widgets"], {"all widgets": 1, "form": 0})
+        self.assertEqual(delta["tcl_commands"], 1)
+        self.assertGreater(delta["memory"], 150000)
+        site, size, _ = delta["allocations"][0]
+        self.assertIn("test_calendar_diagnostics.py", site)
+        self.assertGreater(size, 150000)
+        growth = self.diagnostics.compare(self.diagnostics.baseline, self.diagnostics.sample("now"))
+        self.assertEqual(growth["widgets"]["all widgets"], 2)
+        self.assertIn("rebuild form:", format_delta(delta))
+        self.assertIn("all widgets +1, form +0", self.diagnostics.report())
+
+    def test_destroyed_ignored_widgets_are_released(self):
+        window = FakeWidget(self.root, toplevel=True)
+        FakeWidget(window)
+        self.diagnostics.ignore(window)
+        self.assertEqual(self.diagnostics.widget_counts()["all widgets"], 3)
+        window.destroy()
+        self.assertEqual(self.diagnostics.ignored, set())
+
+    def test_destroying_a_child_keeps_the_window_ignored(self):
+        window = FakeWidget(self.root, toplevel=True)
+        text = FakeWidget(window)
+        self.diagnostics.ignore(window)
+        text.destroy()  # Fires the window's <Destroy> binding too
+        self.assertEqual(self.diagnostics.ignored, {window})
+        self.assertEqual(self.diagnostics.widget_counts()["all widgets"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+# Tests for reusing cached Excel exports
+import unittest
+from unittest import mock
+
+import calendar_export
+from calendar_export import export_bytes
+from calendar_model import CalendarModel
+
+
+def make_model():
+    model = CalendarModel()
+    model.apply({"op": "set_range", "start": "2024-07-01", "end": "2024-09-30"})
+    model.apply({"op": "set_semesters", "semesters": {"UG-S3": ["2024-07-15", "2024-09-27"]}})
+    model.apply({"op": "add_event", "dates": ["2024-08-15"], "event": "Independence Day (Holiday)"})
+    return model
+
+
+class ExportCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.model = make_model()
+        self.first = export_bytes(self.model)
+        self.builds = mock.patch.object(calendar_export, "build_workbook", wraps=calendar_export.build_workbook).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_unchanged_calendar_reuses_the_cached_file(self):
+        self.assertIs(export_bytes(self.model), self.first)
+        self.assertIs(export_bytes(make_model()), self.first)  # Same content in another model
+        self.builds.assert_not_called()
+
+    def test_edits_produce_a_new_file(self):
+        edits = [
+            {"op": "add_event", "dates": ["2024-08-20"], "event": "Quiz"},
+            {"op": "set_semesters", "semesters": {"UG-S3": ["2024-07-15", "2024-09-20"]}},
+            {"op": "set_range", "start": "2024-07-01", "end": "2024-10-31"},
+        ]
+        previous = self.first
+        for count, op in enumerate(edits, start=1):
+            self.model.apply(op)
+            output = export_bytes(self.model)
+            self.assertNotEqual(output, previous, op["op"])
+            self.assertEqual(self.builds.call_count, count)
+            self.assertIs(export_bytes(self.model), output)  # Cached again until the next edit
+            previous = output
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# Tests for merging department calendars
+import csv
+import os
+import tempfile
+import unittest
+
+from calendar_export import export_bytes
+from calendar_merge import event_merges, merge_calendars
+from calendar_model import CalendarModel, read_project, write_project
+
+
+class MergeCalendarsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def department(self, events):
+        model = CalendarModel()
+        model.apply({"op": "set_range", "start": "2024-07-01", "end": "2024-08-31"})
+        for dates, event in events:
+            model.apply({"op": "add_event", "dates": dates, "event": event})
+        return model
+
+    def test_holidays_override_working_events(self):
+        write_project(self.department([(["2024-07-02", "2024-07-03"], "Quiz")]), self.path("cse.calproj"))
+        write_project(self.department([(["2024-07-03"], "Founders Day (Holiday)")]), self.path("ece.calproj"))
+        conflicts = merge_calendars([self.path("cse.calproj"), self.path("ece.calproj")], self.path("master.calproj"), self.path("report.csv"))
+        days = read_project(self.path("master.calproj"))
+        next(days)
+        self.assertEqual({day.isoformat(): events for day, events in days},
+                         {"2024-07-02": ["Quiz"], "2024-07-03": ["Founders Day (Holiday)"]})
+        self.assertEqual(conflicts, 1)
+        with open(self.path("report.csv"), newline="") as report:
+            self.assertEqual(list(csv.reader(report))[1][:3], ["2024-07-03", "cse", "Quiz"])
+
+    def test_exported_workbooks_read_back_like_project_files(self):
+        model = self.department([(["2024-07-15", "2024-07-16", "2024-07-17"], "Finalisation of electives"),
+                                 (["2024-07-31", "2024-08-01"], "Trip"), (["2024-08-26"], "Onam (Holiday)")])
+        with open(self.path("mech.xlsx"), "wb") as workbook:
+            workbook.write(export_bytes(model))
+        self.assertEqual(len(event_merges(self.path("mech.xlsx"))), 1)  # Only the multi-day event within one month
+        merge_calendars([self.path("mech.xlsx")], self.path("master.calproj"), self.path("report.csv"))
+        days = read_project(self.path("master.calproj"))
+        header = next(days)
+        self.assertEqual((header["start"], header["end"]), (model.start, model.end))  # The whole exported range, not just the event dates
+        self.assertEqual(dict(days), {day: model.day_events(day) for day in model.events})
+
+
+if __name__ == "__main__":
+    unittest.main()
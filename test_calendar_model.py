@@ -0,0 +1,156 @@
+# Tests for the calendar model
+import unittest
+from datetime import date, timedelta
+
+from calendar_model import CalendarModel, StringTable, day_span
+from test_support import random_edits
+
+
+def make_model(start="2024-07-01", end="2024-07-31"):
+    model = CalendarModel()
+    model.apply({"op": "set_range", "start": start, "end": end})
+    return model
+
+
+class StringTableTest(unittest.TestCase):
+    def test_released_strings_leave_the_table_and_ids_are_reused(self):
+        table = StringTable()
+        quiz = table.intern("Quiz")
+        self.assertEqual(table.intern("Quiz"), quiz)
+        self.assertFalse(table.release(quiz))
+        self.assertTrue(table.release(quiz))
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.intern("Seminar"), quiz)
+
+    def test_schedule_texts_of_removed_events_are_released(self):
+        model = make_model()
+        day = date(2024, 7, 2)
+        for current in model.days():
+            model.display_text(current)
+        size = len(model.strings)
+        for number in range(20):
+            model.apply({"op": "add_event", "dates": [day.isoformat()], "event": f"Event {number}"})
+            model.display_text(day)
+        self.assertEqual(len(model.strings), size + 20 + 1)  # Event names and the current schedule text only
+        for _ in range(20):
+            model.apply({"op": "remove_last_event"})
+            model.display_text(day)
+        self.assertEqual(len(model.strings), size)
+        self.assertLessEqual(len(model._wrapped), size)
+
+    def test_events_outside_a_new_range_are_released(self):
+        model = make_model()
+        model.apply({"op": "add_event", "dates": ["2024-07-30"], "event": "Quiz"})
+        model.apply({"op": "set_range", "start": "2024-07-01", "end": "2024-07-15"})
+        self.assertNotIn("Quiz", model.strings.ids)
+
+
+class WorkingDayQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.model = make_model("2024-07-01", "2024-12-31")
+        self.model.apply({"op": "add_event", "dates": ["2024-08-15", "2024-08-16"], "event": "Break (Holiday)"})
+        self.model.apply({"op": "add_event", "dates": ["2024-10-31"], "event": "Deepavali"})
+        self.model.apply({"op": "set_semesters", "semesters": {"UG-S3": ["2024-07-15", "2024-11-22"]}})
+
+    def count(self, start, end, weekday=None):
+        """Counts working days one date at a time."""
+        return sum(1 for day in day_span(max(start, self.model.start), min(end, self.model.end))
+                   if self.model.is_working_day(day) and (weekday is None or day.weekday() == weekday))
+
+    def test_prefix_sums_count_the_working_days_before_each_date(self):
+        total = self.model.prefix_sums()
+        mondays = self.model.prefix_sums("Monday")
+        for index, day in enumerate(self.model.days()):
+            self.assertEqual(total[index + 1] - total[index], int(self.model.is_working_day(day)))
+            self.assertEqual(mondays[index + 1], self.count(self.model.start, day, 0))
+        self.assertEqual(len(total), (self.model.end - self.model.start).days + 2)
+
+    def test_working_days_between_matches_counting_each_date(self):
+        start = date(2024, 6, 20)
+        for offset in range(0, 220, 7):
+            for length in (0, 1, 13, 60):
+                first = start + timedelta(days=offset)
+                last = first + timedelta(days=length)
+                self.assertEqual(self.model.working_days_between(first, last), self.count(first, last))
+                self.assertEqual(self.model.working_days_between(first, last, weekday="Saturday"), self.count(first, last, 5))
+
+    def test_holidays_and_semesters_are_counted(self):
+        self.assertFalse(self.model.is_working_day(date(2024, 8, 15)))
+        self.assertFalse(self.model.is_working_day(date(2024, 10, 31)))  # Festival without "(Holiday)"
+        self.assertFalse(self.model.is_working_day(date(2024, 7, 13)))  # 2nd Saturday
+        self.assertEqual(self.model.semester_working_days()["UG-S3"], self.count(date(2024, 7, 15), date(2024, 11, 22)))
+        self.assertEqual(self.model.working_days_between("2024-01-01", "2024-12-31", semester="UG-S3"),
+                         self.model.semester_working_days()["UG-S3"])
+
+    def test_counts_follow_changes(self):
+        before = self.model.working_days_between("2024-09-02", "2024-09-06")
+        self.model.apply({"op": "add_event", "dates": ["2024-09-03"], "event": "Onam (Holiday)"})
+        self.assertEqual(self.model.working_days_between("2024-09-02", "2024-09-06"), before - 1)
+        self.model.apply({"op": "remove_last_event"})
+        self.assertEqual(self.model.working_days_between("2024-09-02", "2024-09-06"), before)
+
+    def test_counts_are_kept_or_patched_instead_of_rebuilt(self):
+        total = self.model.prefix_sums()
+        self.model.apply({"op": "add_event", "dates": ["2024-09-03"], "event": "Quiz"})  # Still a working day
+        self.model.apply({"op": "set_semesters", "semesters": {}})
+        self.assertIs(self.model.prefix_sums(), total)
+        self.model.apply({"op": "add_event", "dates": ["2024-09-03", "2024-12-07"], "event": "Onam (Holiday)"})
+        self.assertIs(self.model.prefix_sums(), total)
+        fresh = CalendarModel()
+        fresh.load(self.model.snapshot())
+        for weekday in [None] + list(range(7)):
+            self.assertEqual(self.model.prefix_sums(weekday), fresh.prefix_sums(weekday), weekday)
+
+
+class EndDateSolverTest(unittest.TestCase):
+    def setUp(self):
+        self.model = make_model("2024-07-01", "2025-03-31")
+        self.model.apply({"op": "add_event", "dates": ["2024-10-31", "2024-11-01"], "event": "Deepavali (Holiday)"})
+        self.start = date(2024, 7, 15)
+
+    def targets_met(self, end, min_days, weekday_minimums, max_days=None):
+        count = self.model.working_days_between(self.start, end)
+        return (count >= min_days and (max_days is None or count <= max_days) and
+                all(self.model.working_days_between(self.start, end, weekday=day) >= minimum
+                    for day, minimum in weekday_minimums.items()))
+
+    def test_end_date_range_matches_trying_every_end_date(self):
+        for min_days, weekday_minimums, max_days in [(90, {}, None), (60, {"Monday": 14, "Friday": 15}, None),
+                                                     (90, {}, 95), (0, {}, None), (400, {}, None), (90, {}, 80)]:
+            valid = [day for day in day_span(self.start, self.model.end) if self.targets_met(day, min_days, weekday_minimums, max_days)]
+            expected = (valid[0], valid[-1]) if valid else None
+            self.assertEqual(self.model.end_date_range(self.start, min_days, weekday_minimums, max_days), expected)
+
+    def test_earliest_end_date(self):
+        end = self.model.earliest_end_date(self.start, 90)
+        self.assertEqual(self.model.working_days_between(self.start, end), 90)
+        self.assertTrue(self.model.is_working_day(end))
+        self.assertIsNone(self.model.earliest_end_date(self.start, 1000))
+
+    def test_start_outside_the_range_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.model.end_date_range(date(2024, 6, 1), 90)
+
+
+class RangeChangeTest(unittest.TestCase):
+    def changed(self, model, start, end):
+        return model.apply({"op": "set_range", "start": start, "end": end})["dates"]
+
+    def test_only_dates_entering_or_leaving_the_range_are_reported(self):
+        model = make_model("2024-07-10", "2024-07-20")
+        self.assertEqual(self.changed(model, "2024-07-10", "2024-07-20"), [])
+        self.assertEqual(self.changed(model, "2024-07-08", "2024-07-18"),
+                         ["2024-07-08", "2024-07-09", "2024-07-19", "2024-07-20"])
+        self.assertEqual(self.changed(model, "2024-07-20", "2024-07-21"),  # Disjoint: both ranges
+                         [day.isoformat() for day in day_span(date(2024, 7, 8), date(2024, 7, 18))] + ["2024-07-20", "2024-07-21"])
+
+    def test_working_days_match_a_fresh_model(self):
+        model = make_model("2024-07-01", "2024-12-31")
+        for _ in random_edits(model, seed=3):
+            fresh = CalendarModel()
+            fresh.load(model.snapshot())
+            self.assertEqual(model._working, fresh._working)
+
+
+if __name__ == "__main__":
+    unittest.main()
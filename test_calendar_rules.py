@@ -0,0 +1,34 @@
+# Tests for the calendar policy checker
+import unittest
+
+from calendar_model import CalendarModel
+from calendar_rules import PolicyChecker
+from test_support import random_edits
+
+
+class PolicyCheckerTest(unittest.TestCase):
+    def setUp(self):
+        self.model = CalendarModel()
+        self.model.apply({"op": "set_range", "start": "2024-07-01", "end": "2024-12-31"})
+        self.model.apply({"op": "set_semesters", "semesters": {"UG-S1": ["2024-07-15", "2024-11-29"], "UG-S3": ["2024-08-01", "2024-09-30"]}})
+        self.checker = PolicyChecker(self.model)
+
+    def test_rules(self):
+        self.model.apply({"op": "add_event", "dates": ["2024-07-13"], "event": "Quiz"})  # 2nd Saturday
+        self.model.apply({"op": "add_event", "dates": ["2024-10-31"], "event": "Deepavali"})
+        self.model.apply({"op": "add_event", "dates": ["2024-10-31"], "event": "End semester exam"})
+        self.assertEqual(self.checker.messages(), [
+            "UG-S3: 48 instruction days, at least 90 needed",
+            "13/07/24: Event on a holiday Saturday: Quiz",
+            "31/10/24: Exam on a holiday: End semester exam",
+        ])
+
+    def test_edits_and_range_changes_match_a_full_check(self):
+        for _ in random_edits(self.model, seed=7, semesters=True):
+            fresh = PolicyChecker(self.model)
+            self.model.unsubscribe(fresh.refresh)
+            self.assertEqual(self.checker.violations, fresh.violations)
+
+
+if __name__ == "__main__":
+    unittest.main()
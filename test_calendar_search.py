@@ -0,0 +1,39 @@
+# Tests for the event search index
+import unittest
+from datetime import date
+
+from calendar_model import CalendarModel
+from calendar_search import EventIndex
+from test_support import random_edits
+
+
+class EventIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.model = CalendarModel()
+        self.model.apply({"op": "set_range", "start": "2024-07-01", "end": "2024-12-31"})
+        self.index = EventIndex(self.model)
+
+    def assert_matches_a_fresh_index(self):
+        fresh = EventIndex(self.model)
+        self.model.unsubscribe(fresh.refresh)
+        for name in ("postings", "words", "day_words", "event_days", "holidays"):
+            self.assertEqual(getattr(self.index, name), getattr(fresh, name), name)
+
+    def test_search_and_occurrences(self):
+        self.model.apply({"op": "add_event", "dates": ["2024-09-16", "2024-09-17"], "event": "Mid semester exam"})
+        self.model.apply({"op": "add_event", "dates": ["2024-10-01"], "event": "Missed mid semester exam"})
+        self.model.apply({"op": "add_event", "dates": ["2024-10-31"], "event": "Deepavali"})
+        self.assertEqual(self.index.search("mid sem"), [date(2024, 9, 16), date(2024, 9, 17), date(2024, 10, 1)])
+        self.assertEqual(self.index.search("missed"), [date(2024, 10, 1)])
+        self.assertEqual(self.index.next_occurrence("exam", after=date(2024, 9, 17)), date(2024, 10, 1))
+        self.assertEqual(self.index.previous_occurrence("exam", before=date(2024, 9, 17)), date(2024, 9, 16))
+        self.assertIsNone(self.index.next_occurrence("exam", after=date(2024, 10, 1)))
+        self.assertEqual(self.index.next_occurrence(after=date(2024, 10, 26), holiday=True), date(2024, 10, 31))  # After the 4th Saturday
+
+    def test_edits_and_range_changes_keep_the_index_current(self):
+        for _ in random_edits(self.model, seed=4):
+            self.assert_matches_a_fresh_index()
+
+
+if __name__ == "__main__":
+    unittest.main()
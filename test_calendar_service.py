@@ -0,0 +1,46 @@
+# Tests for the shared calendar service
+import json
+import unittest
+
+from calendar_service import CalendarService
+
+
+class CalendarServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.service = CalendarService()
+        self.post({"op": "set_range", "start": "2024-07-01", "end": "2024-07-31"})
+
+    def post(self, op, version=None):
+        return self.service.dispatch("POST", "/ops", json.dumps({"op": op, "version": version}).encode())
+
+    def get(self, path):
+        status, payload = self.service.dispatch("GET", path, b"")
+        return status, json.loads(payload) if isinstance(payload, bytes) else payload
+
+    def test_remove_last_event_only_removes_the_authors_event(self):
+        self.post({"op": "add_event", "dates": ["2024-07-02"], "event": "Quiz", "author": "a"})
+        self.post({"op": "add_event", "dates": ["2024-07-03"], "event": "Seminar", "author": "b"})
+        status, _ = self.post({"op": "remove_last_event", "author": "a"})
+        self.assertEqual(status, 200)
+        self.assertEqual(self.get("/events")[1]["events"], {"2024-07-03": ["Seminar"]})
+        status, payload = self.post({"op": "remove_last_event", "author": "a"})
+        self.assertEqual((status, payload["error"]), (400, "No events to clear."))
+
+    def test_outdated_version_is_refused(self):
+        version = self.service.model.version
+        self.post({"op": "add_event", "dates": ["2024-07-02"], "event": "Quiz"})
+        status, payload = self.post({"op": "set_range", "start": "2024-07-01", "end": "2024-08-31"}, version)
+        self.assertEqual(status, 409)
+        self.assertEqual(payload["version"], version + 1)
+        self.assertEqual(self.get("/range")[1]["end"], "2024-07-31")
+
+    def test_cached_reads_follow_changes(self):
+        self.assertEqual(self.get("/events")[1]["events"], {})
+        self.post({"op": "add_event", "dates": ["2024-07-02"], "event": "Quiz"})
+        status, payload = self.get("/events")
+        self.assertEqual(payload, {"version": self.service.model.version, "events": {"2024-07-02": ["Quiz"]}})
+        self.assertEqual(self.get("/calendar")[1]["events"], {"2024-07-02": ["Quiz"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# Tests for placing academic template events
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from calendar_model import CalendarModel, parse_date
+from calendar_templates import DEFAULT_TEMPLATE, load_template, resolve_template, template_ops
+
+
+def make_model():
+    model = CalendarModel()
+    model.apply({"op": "set_range", "start": "2024-07-01", "end": "2024-12-31"})
+    model.apply({"op": "add_event", "dates": ["2024-07-15", "2024-11-22"], "event": "Break (Holiday)"})
+    # Starts on a Sunday followed by a holiday, ends on a Sunday after a 4th Saturday and a holiday
+    model.apply({"op": "set_semesters", "semesters": {"UG-S3": ["2024-07-14", "2024-11-24"]}})
+    return model
+
+
+def walk(model, day, forward, working_days):
+    """Places an event one date at a time: moves to a working day, then counts working days."""
+    step = timedelta(days=1 if forward else -1)
+    while model.start <= day <= model.end and not model.is_working_day(day):
+        day += step
+    step = timedelta(days=1 if working_days > 0 else -1)
+    for _ in range(abs(working_days)):
+        day += step
+        while model.start <= day <= model.end and not model.is_working_day(day):
+            day += step
+    return day if model.start <= day <= model.end else None
+
+
+class ResolveTemplateTest(unittest.TestCase):
+    def setUp(self):
+        self.model = make_model()
+
+    def place(self, **entry):
+        placed, skipped = resolve_template(self.model, [dict(entry, event="Event")])
+        return placed.get("Event"), skipped
+
+    def test_anchors_on_holidays_move_to_the_nearest_working_day_inside_the_semester(self):
+        self.assertEqual(self.place(anchor="start"), ([date(2024, 7, 16)], []))
+        self.assertEqual(self.place(anchor="end"), ([date(2024, 11, 21)], []))
+
+    def test_working_days_skip_holidays_in_both_directions(self):
+        self.assertEqual(self.place(anchor="end", working_days=1), ([date(2024, 11, 25)], []))
+        self.assertEqual(self.place(anchor="end", working_days=-1), ([date(2024, 11, 20)], []))
+        self.assertEqual(self.place(anchor="start", working_days=-1), ([date(2024, 7, 12)], []))
+
+    def test_matches_walking_one_date_at_a_time(self):
+        for anchor in ("start", "end"):
+            for weeks in range(-3, 30, 4):
+                for working_days in range(-12, 13, 3):
+                    placed, _ = self.place(anchor=anchor, weeks=weeks, working_days=working_days)
+                    start, end = self.model.semesters["UG-S3"]
+                    day = parse_date(start if anchor == "start" else end) + timedelta(weeks=weeks)
+                    expected = walk(self.model, day, anchor == "start", working_days) if self.model.start <= day <= self.model.end else None
+                    self.assertEqual(placed, [expected] if expected else None, (anchor, weeks, working_days))
+
+    def test_events_outside_the_range_are_skipped(self):
+        self.assertEqual(self.place(anchor="start", weeks=30), (None, [("Event", "UG-S3")]))
+        self.assertEqual(self.place(anchor="start", weeks=-2, working_days=-10), (None, [("Event", "UG-S3")]))  # Before the first working day
+        self.assertEqual(self.place(anchor="end", working_days=40), (None, [("Event", "UG-S3")]))  # After the last working day
+
+    def test_semester_filter_and_holiday_marker(self):
+        placed, skipped = resolve_template(self.model, [{"event": "Onam", "anchor": "start", "holiday": True},
+                                                        {"event": "Viva", "semesters": ["PG-S1"]}])
+        self.assertEqual(placed, {"Onam (Holiday)": [date(2024, 7, 16)]})
+        self.assertEqual(skipped, [])
+
+
+class TemplateOpsTest(unittest.TestCase):
+    def test_reapplying_a_template_adds_nothing(self):
+        model = make_model()
+        ops, skipped = template_ops(model)
+        self.assertEqual(len(ops), len(DEFAULT_TEMPLATE))
+        self.assertEqual(skipped, [])
+        for op in ops:
+            model.apply(op)
+        self.assertEqual(template_ops(model), ([], []))
+
+    def test_events_already_on_some_dates_are_only_added_to_the_others(self):
+        model = make_model()
+        model.apply({"op": "set_semesters", "semesters": {"UG-S3": ["2024-07-14", "2024-11-24"], "UG-S5": ["2024-07-22", "2024-11-24"]}})
+        template = [{"event": "Commencement", "anchor": "start"}]
+        model.apply({"op": "add_event", "dates": ["2024-07-16"], "event": "Commencement"})
+        self.assertEqual(template_ops(model, template)[0], [{"op": "add_event", "dates": ["2024-07-22"], "event": "Commencement"}])
+
+
+class LoadTemplateTest(unittest.TestCase):
+    def load(self, template):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as template_file:
+            json.dump(template, template_file)
+        self.addCleanup(os.remove, template_file.name)
+        return load_template(template_file.name)
+
+    def test_saved_templates_are_read_and_checked(self):
+        self.assertEqual(self.load(DEFAULT_TEMPLATE), DEFAULT_TEMPLATE)
+        for template in ([{"anchor": "start"}], [{"event": "Quiz", "anchor": "middle"}], ["Quiz"], {"event": "Quiz"}):
+            with self.assertRaises(ValueError):
+                self.load(template)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+# Shared helpers for the calendar tests
+import random
+from datetime import date, timedelta
+
+EVENTS = ["Mid semester exam", "Missed mid semester exam", "Quiz", "Deepavali", "Sports day (Holiday)"]
+
+
+def random_edits(model, seed, steps=200, events=EVENTS, semesters=False):
+    """Applies random edits to a calendar covering 2024, yielding after each one.
+
+    The edits add events on random dates, remove the last event and move the range, so tests can
+    compare state kept up to date incrementally with a fresh one. With semesters UG-S1 gets random
+    end dates too.
+    """
+    generator = random.Random(seed)
+    for _ in range(steps):
+        choice = generator.random()
+        if choice < 0.6:
+            day = model.start + timedelta(days=generator.randrange((model.end - model.start).days + 1))
+            model.apply({"op": "add_event", "dates": [day.isoformat()], "event": generator.choice(events)})
+        elif choice < 0.8 and model.history:
+            model.apply({"op": "remove_last_event"})
+        elif choice < 0.95 or not semesters:
+            start = date(2024, 7, 1) + timedelta(days=generator.randrange(60))
+            end = start + timedelta(days=generator.randrange(60, 200))
+            model.apply({"op": "set_range", "start": start.isoformat(), "end": end.isoformat()})
+        else:
+            end = date(2024, 10, 1) + timedelta(days=generator.randrange(60))
+            model.apply({"op": "set_semesters", "semesters": {"UG-S1": ["2024-07-15", end.isoformat()]}})
+        yield